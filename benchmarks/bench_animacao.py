@@ -0,0 +1,59 @@
+"""Micro-benchmark da montagem da árvore de animação de um slide.
+
+Mede o custo por slide de `_adicionar_sequencia_animacao` em função do número de prints e o compara
+com a montagem antiga (uma string XML formatada e interpretada por nó). Não usa imagens reais:
+apenas a árvore de timing é montada sobre um slide vazio.
+
+Uso (na raiz do repositório):  python benchmarks/bench_animacao.py [repeticoes]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pptx import Presentation
+from pptx.oxml import parse_xml
+
+import main
+
+NS_P = 'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main"'
+
+
+def _legado(slide, shape_ids):
+    """Montagem original: um `parse_xml` por nó de animação e por grupo de clique."""
+    main_sequence = main._get_or_create_main_sequence(slide)
+    id_counter = main.IdCounter(10)
+    for saindo, entrando in zip(shape_ids, shape_ids[1:]):
+        nos = []
+        for shape_id, node_type, preset, visibility in ((saindo, 'clickEffect', 'exit', 'hidden'), (entrando, 'afterEffect', 'entr', 'visible')):
+            nos.append(parse_xml(f'<p:par {NS_P}><p:cTn id="{id_counter.get()}" fill="hold" nodeType="{node_type}" presetClass="{preset}" presetID="1" presetSubtype="0"><p:stCondLst><p:cond delay="0"/></p:stCondLst><p:childTnLst><p:set><p:cBhvr><p:cTn id="{id_counter.get()+1}" dur="1" fill="hold"><p:stCondLst><p:cond delay="0"/></p:stCondLst></p:cTn><p:tgtEl><p:spTgt spid="{shape_id}"/></p:tgtEl><p:attrNameLst><p:attrName>style.visibility</p:attrName></p:attrNameLst></p:cBhvr><p:to><p:strVal val="{visibility}"/></p:to></p:set></p:childTnLst></p:cTn></p:par>'))
+            id_counter.increment(2)
+        grupo = parse_xml(f'<p:par {NS_P}><p:cTn id="{id_counter.get()}" fill="hold"><p:stCondLst><p:cond delay="indefinite"/></p:stCondLst><p:childTnLst><p:par><p:cTn id="{id_counter.increment()}" fill="hold"><p:stCondLst><p:cond delay="0"/></p:stCondLst><p:childTnLst/></p:cTn></p:par></p:childTnLst></p:cTn></p:par>')
+        id_counter.increment()
+        destino = grupo.find('.//p:cTn/p:childTnLst/p:par/p:cTn/p:childTnLst', grupo.nsmap)
+        for no in nos: destino.append(no)
+        main_sequence.append(grupo)
+
+
+def medir(funcao, n_prints, repeticoes):
+    prs = Presentation()
+    layout = prs.slide_layouts[6]
+    shape_ids = list(range(100, 100 + n_prints))
+    # Cada repetição usa um slide novo, para que a árvore não cresça entre as medições.
+    slides = [prs.slides.add_slide(layout) for _ in range(repeticoes)]
+    iterador = iter(slides)
+    return timeit.timeit(lambda: funcao(next(iterador), shape_ids), number=repeticoes) / repeticoes
+
+
+def main_benchmark():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    print(f"{'prints':>7} | {'legado (ms/slide)':>18} | {'modelos (ms/slide)':>19} | {'ganho':>6}")
+    for n_prints in (2, 5, 10, 25, 50, 100):
+        legado = medir(_legado, n_prints, repeticoes)
+        novo = medir(main._adicionar_sequencia_animacao, n_prints, repeticoes)
+        print(f"{n_prints:>7} | {legado * 1000:>18.3f} | {novo * 1000:>19.3f} | {legado / novo:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main_benchmark()
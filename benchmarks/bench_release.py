@@ -0,0 +1,190 @@
+"""Benchmark de ponta a ponta: verificação, CSV, apresentação e distribuição sobre dados sintéticos.
+
+Gera uma árvore de prints no formato esperado por `process_directory`, um banco SQLite com as tabelas
+consultadas pela ferramenta (no lugar do MySQL) e sobe um stub local da API do Movidesk. Cada etapa roda
+em um processo novo, para que o pico de memória medido seja só dela. São informados o tempo, a vazão
+(tarefas, prints ou tickets por segundo) e o pico de memória residente de cada etapa.
+
+Com --salvar o resultado é gravado em JSON; com --comparar ele é confrontado com um resultado anterior
+e o script falha (código de saída 1) se alguma etapa perder vazão ou ganhar memória além da tolerância.
+Antes das etapas, `checar_codificacao` confere que nenhum formato de incorporação devolve um print maior
+que a sua versão reduzida; o script também falha se isso acontecer.
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_release.py [--pastas 3] [--tarefas 10] [--prints 3] [--resolucao 1920x1080]
+                                       [--latencia-ms 20] [--salvar base.json] [--comparar base.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+try:
+    import resource
+except ImportError:  # Windows: o pico passa a ser o da memória alocada pelo Python (tracemalloc).
+    resource = None
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import sinteticos  # noqa: E402
+
+PROJETO = 4242
+VERSAO_NOVO, VERSAO_FINAL = "v1", "X.Y.015"
+ETAPAS = ("verificacao", "csv", "pptx_frio", "pptx_cache", "distribuicao")
+
+
+def _pico_rss():
+    """Pico de memória residente (bytes) deste processo e dos processos filhos já encerrados."""
+    escala = 1 if sys.platform == "darwin" else 1024
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * escala, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * escala)
+
+
+def _executar_etapa(etapa, area, url_stub, itens):
+    """Roda uma etapa dentro de um processo novo, com o banco SQLite e o stub do Movidesk no lugar dos reais."""
+    os.chdir(area)
+    import main
+    main._conectar_banco = lambda: sinteticos.ConexaoSQLite(os.path.join(area, "banco.sqlite"))
+    base_dir = os.path.join(area, "ativos", VERSAO_NOVO)
+    if resource is None: tracemalloc.start()
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if etapa == "verificacao":
+            main.verificar_projeto_no_banco(PROJETO, base_dir)
+        elif etapa == "csv":
+            main.generate_csv_from_project(PROJETO, VERSAO_NOVO, "tickets.csv")
+        elif etapa.startswith("pptx"):
+            if etapa == "pptx_frio": shutil.rmtree(main.CACHE_PRINTS_DIR, ignore_errors=True)
+            main.gerar_apresentacao(base_dir, VERSAO_FINAL, VERSAO_NOVO, "A", main.read_tickets_csv("tickets.csv"),
+                                    main.extrair_numero_final(VERSAO_FINAL), "apresentacao.pptx", incremental=False)
+        else:
+            with contextlib.suppress(FileNotFoundError): os.remove(os.path.join(main.LOGS_DIR, "distribuicao_journal.jsonl"))
+            main._CLIENTE_MOVIDESK = main.ClienteMovidesk(base_url=url_stub, token="benchmark", requisicoes_por_minuto=600000, backoff=0.01)
+            main.distribute_tickets("tickets.csv", VERSAO_NOVO)
+    segundos = time.perf_counter() - inicio
+    pico, pico_filhos = _pico_rss() if resource else (tracemalloc.get_traced_memory()[1], 0)
+    return {"segundos": round(segundos, 4), "itens": itens, "itens_por_s": round(itens / segundos, 2),
+            "pico_memoria": pico, "pico_memoria_filhos": pico_filhos}
+
+
+def preparar_area(area, args):
+    """Cria a árvore de prints, o banco, o template e a pasta de trabalho; retorna as tarefas geradas."""
+    from pptx import Presentation
+    tarefas = sinteticos.gerar_arvore(os.path.join(area, "ativos", VERSAO_NOVO), args.pastas, args.tarefas, args.prints, args.resolucao)
+    sinteticos.criar_banco(os.path.join(area, "banco.sqlite"), PROJETO, tarefas)
+    Presentation().save(os.path.join(area, "Layout-Base.pptx"))
+    for pasta in ("logs", "relatorios", "powerpoint"): os.makedirs(os.path.join(area, pasta), exist_ok=True)
+    return tarefas
+
+
+def checar_codificacao():
+    """Lista os formatos em que `add_order_to_image` devolve algo maior que o print reduzido à caixa do slide.
+
+    Usa um print grande e de poucas cores, cujo PNG de origem é menor que a versão reduzida: é o caso em
+    que o print também é codificado no tamanho original e só a menor das duas codificações pode ficar.
+    """
+    import main
+    from PIL import Image, ImageDraw
+    img = Image.new("RGB", (3000, 2000), (255, 255, 255))
+    draw = ImageDraw.Draw(img)
+    for i in range(0, 2000, 40): draw.line((0, i, 3000, i + 300), fill=(0, 109, 105), width=3)
+    origem = io.BytesIO()
+    img.save(origem, format="PNG")
+    caixa, falhas = (1200, 787), []
+    for formato in ("auto", "png", "jpeg"):
+        politica = main.PoliticaImagem(150, formato, 85)
+        dados = main.add_order_to_image(io.BytesIO(origem.getvalue()), 1, 1, caixa=caixa, politica=politica)
+        reduzida = img.copy()
+        reduzida.thumbnail(caixa, Image.LANCZOS)
+        cores = img.getcolors(254) if formato != "jpeg" else None
+        referencia = main._codificar_imagem(main._desenhar_ordem(reduzida, 1, 1, 20), politica, cores and cores + [(0, (0, 0, 0)), (0, (255, 255, 255))], reduzida=True)
+        if len(dados) > len(referencia):
+            falhas.append(f"{formato}: {len(dados) / 1024:.0f} KB incorporados > {len(referencia) / 1024:.0f} KB da versão reduzida")
+    return falhas
+
+
+def comparar(resultado, base, tolerancia):
+    """Lista as regressões de `resultado` em relação a `base` (vazão menor ou memória maior que a tolerância)."""
+    if resultado["parametros"] != base.get("parametros"): print("AVISO: parâmetros diferentes dos da base; a comparação é aproximada.")
+    regressoes = []
+    for etapa, atual in resultado["etapas"].items():
+        if not (anterior := base.get("etapas", {}).get(etapa)): continue
+        if atual["itens_por_s"] < anterior["itens_por_s"] * (1 - tolerancia):
+            regressoes.append(f"{etapa}: vazão {atual['itens_por_s']:.1f}/s < {anterior['itens_por_s']:.1f}/s da base")
+        if atual["pico_memoria"] > anterior["pico_memoria"] * (1 + tolerancia):
+            regressoes.append(f"{etapa}: memória {atual['pico_memoria'] / 2**20:.0f} MB > {anterior['pico_memoria'] / 2**20:.0f} MB da base")
+    return regressoes
+
+
+def _resolucao(texto):
+    largura, altura = texto.lower().split("x")
+    return int(largura), int(altura)
+
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description="Benchmark de ponta a ponta com dados sintéticos.")
+    parser.add_argument("--pastas", type=int, default=3, help="Pastas de versão por seção (new/old)")
+    parser.add_argument("--tarefas", type=int, default=10, help="Tarefas por pasta de versão")
+    parser.add_argument("--prints", type=int, default=3, help="Prints por tarefa")
+    parser.add_argument("--resolucao", type=_resolucao, default=(1920, 1080), help="LARGURAxALTURA dos prints")
+    parser.add_argument("--latencia-ms", type=float, default=20, help="Latência de cada requisição ao stub do Movidesk")
+    parser.add_argument("--fracao-429", type=float, default=0.05, help="Fração das requisições recusadas com 429 pelo stub")
+    parser.add_argument("--etapas", nargs="+", choices=ETAPAS, default=ETAPAS)
+    parser.add_argument("--salvar", help="Grava o resultado neste arquivo JSON")
+    parser.add_argument("--comparar", help="Compara com um resultado salvo antes e falha se houver regressão")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Variação aceita na comparação (0.2 = 20%%)")
+    parser.add_argument("--manter", action="store_true", help="Não apaga a pasta de trabalho ao final")
+    args = parser.parse_args()
+
+    # Em processo próprio: no Linux o pico de memória do processo principal é herdado pelos filhos
+    # e inflaria a medida de todas as etapas.
+    with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as executor: falhas = executor.submit(checar_codificacao).result()
+    if falhas:
+        for falha in falhas: print(f"CODIFICAÇÃO: {falha}")
+        return 1
+    area = tempfile.mkdtemp(prefix="bench_release_")
+    try:
+        inicio = time.perf_counter()
+        tarefas = preparar_area(area, args)
+        total_prints = sum(t["prints"] for t in tarefas)
+        print(f"Área de trabalho: {area} ({len(tarefas)} tarefas, {total_prints} prints, gerados em {time.perf_counter() - inicio:.1f}s)")
+        itens = {"verificacao": len(tarefas), "csv": len(tarefas), "pptx_frio": total_prints, "pptx_cache": total_prints, "distribuicao": len(tarefas)}
+        resultado = {"parametros": {"pastas": args.pastas, "tarefas": args.tarefas, "prints": args.prints, "resolucao": list(args.resolucao),
+                                    "latencia_ms": args.latencia_ms, "fracao_429": args.fracao_429},
+                     "memoria": "rss" if resource else "tracemalloc", "etapas": {}}
+        print(f"{'etapa':<13} | {'tempo (s)':>9} | {'itens':>6} | {'itens/s':>9} | {'pico (MB)':>9} | {'filhos (MB)':>11}")
+        with sinteticos.StubMovidesk(args.latencia_ms / 1000, args.fracao_429) as stub:
+            # As etapas seguem a ordem do release, pois cada uma consome o que a anterior gerou (CSV, cache).
+            for etapa in (e for e in ETAPAS if e in args.etapas):
+                with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as executor:
+                    medida = executor.submit(_executar_etapa, etapa, area, stub.url, itens[etapa]).result()
+                resultado["etapas"][etapa] = medida
+                print(f"{etapa:<13} | {medida['segundos']:>9.2f} | {medida['itens']:>6} | {medida['itens_por_s']:>9.1f} | "
+                      f"{medida['pico_memoria'] / 2**20:>9.0f} | {medida['pico_memoria_filhos'] / 2**20:>11.0f}")
+            resultado["stub_movidesk"] = dict(stub.contagem)
+        print(f"Stub do Movidesk: {stub.contagem['GET']} GET, {stub.contagem['PATCH']} PATCH, {stub.contagem['429']} respostas 429")
+    finally:
+        if args.manter: print(f"Pasta de trabalho mantida em {area}")
+        else: shutil.rmtree(area, ignore_errors=True)
+
+    if args.salvar:
+        with open(args.salvar, "w", encoding="utf-8") as f: json.dump(resultado, f, ensure_ascii=False, indent=2)
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f: base = json.load(f)
+        if regressoes := comparar(resultado, base, args.tolerancia):
+            for regressao in regressoes: print(f"REGRESSÃO: {regressao}")
+            return 1
+        print(f"Sem regressões em relação a '{args.comparar}' (tolerância de {args.tolerancia:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_benchmark())
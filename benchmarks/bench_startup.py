@@ -0,0 +1,42 @@
+"""Verificação do orçamento de tempo de inicialização da ferramenta.
+
+Importa `main` em um processo novo com `python -X importtime`, pega o tempo acumulado da importação
+(melhor de N execuções) e falha (código de saída 1) se ele passar do orçamento ou se alguma das
+bibliotecas pesadas for carregada antes de o usuário escolher uma ação do menu.
+
+Uso (na raiz do repositório):  python benchmarks/bench_startup.py [orcamento_ms] [execucoes]
+O orçamento também pode vir da variável de ambiente STARTUP_BUDGET_MS (padrão: 150 ms).
+"""
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BIBLIOTECAS_PESADAS = ("pptx", "PIL", "pymysql", "requests", "lxml")
+
+
+def tempo_de_importacao_ms():
+    """Retorna o tempo acumulado de `import main` (ms) e as bibliotecas pesadas carregadas por ele."""
+    codigo = f"import sys, main; print(','.join(m for m in {BIBLIOTECAS_PESADAS!r} if m in sys.modules))"
+    resultado = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo], cwd=RAIZ, capture_output=True, text=True, check=True)
+    for linha in resultado.stderr.splitlines():
+        partes = [p.strip() for p in linha.split("|")]
+        if len(partes) == 3 and partes[2] == "main":
+            return int(partes[1]) / 1000, [m for m in resultado.stdout.strip().split(",") if m]
+    raise RuntimeError("Linha de 'main' não encontrada na saída de -X importtime.")
+
+
+def main_benchmark():
+    orcamento = float(sys.argv[1]) if len(sys.argv) > 1 else float(os.getenv("STARTUP_BUDGET_MS", 150))
+    execucoes = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    medicoes = [tempo_de_importacao_ms() for _ in range(execucoes)]
+    melhor = min(ms for ms, _ in medicoes)
+    pesadas = sorted({m for _, carregadas in medicoes for m in carregadas})
+    print(f"import main: {melhor:.1f} ms (melhor de {execucoes}; orçamento {orcamento:.0f} ms)")
+    if pesadas: print(f"FALHA: bibliotecas pesadas carregadas na inicialização: {', '.join(pesadas)}")
+    if melhor > orcamento: print("FALHA: inicialização acima do orçamento.")
+    return 1 if pesadas or melhor > orcamento else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_benchmark())
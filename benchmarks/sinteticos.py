@@ -0,0 +1,172 @@
+"""Dados sintéticos para os benchmarks: árvore de prints, banco SQLite no lugar do MySQL e stub do Movidesk.
+
+Nada aqui acessa o compartilhamento real, o banco de produção ou a API do Movidesk. Tudo é gerado de
+forma determinística a partir de uma semente, para que duas execuções meçam exatamente o mesmo trabalho.
+"""
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from PIL import Image, ImageDraw
+
+# Tarefa sintética: `tem_pasta`/`prints` dizem o que existe em disco; o resto vai para o banco.
+ID_PAPEL_QA = 2
+ID_QA = 10
+
+
+def _print_sintetico(largura, altura, rnd):
+    """Imita uma captura de tela: fundo claro, barras, blocos de texto e alguns ícones coloridos."""
+    img = Image.new("RGB", (largura, altura), (245, 246, 248))
+    draw = ImageDraw.Draw(img)
+    draw.rectangle((0, 0, largura, altura // 18), fill=(0, 109, 105))
+    draw.rectangle((0, altura // 18, largura // 6, altura), fill=(228, 231, 235))
+    for _ in range(rnd.randint(20, 60)):
+        x, y = rnd.randrange(largura // 6, largura - 40), rnd.randrange(altura // 18, altura - 12)
+        draw.rectangle((x, y, min(largura, x + rnd.randint(30, 400)), y + rnd.randint(6, 14)), fill=(rnd.randint(40, 120),) * 3)
+    for _ in range(rnd.randint(3, 10)):
+        x, y = rnd.randrange(largura - 30), rnd.randrange(altura - 30)
+        draw.ellipse((x, y, x + 24, y + 24), fill=(rnd.randrange(256), rnd.randrange(256), rnd.randrange(256)))
+    return img
+
+
+def gerar_arvore(base_dir, pastas_por_secao=3, tarefas_por_pasta=10, prints_por_tarefa=3, resolucao=(1920, 1080),
+                 fracao_sem_pasta=0.05, fracao_sem_prints=0.05, semente=42):
+    """Cria `base_dir/{new,old}/<pasta de versão>/<suite - título>/pNN.png` e retorna as tarefas geradas.
+
+    Em "new" as pastas são "novo" e "A 1", "A 2"...; em "old", "final" e "B 11", "B 12"... Uma fração das
+    tarefas fica sem pasta ou com a pasta vazia, para a verificação ter pendências a relatar.
+    """
+    rnd = random.Random(semente)
+    tarefas, suite = [], 1000
+    for section, primeira, prefixo, inicio in (("new", "novo", "A", 1), ("old", "final", "B", 11)):
+        pastas = [primeira] + [f"{prefixo} {inicio + i}" for i in range(pastas_por_secao - 1)]
+        for pasta in pastas:
+            for t in range(tarefas_por_pasta):
+                suite += 1
+                sorteio = rnd.random()
+                tem_pasta = sorteio >= fracao_sem_pasta
+                prints = prints_por_tarefa if sorteio >= fracao_sem_pasta + fracao_sem_prints else 0
+                titulo = f"Tarefa sintética {t} da pasta {pasta}"
+                if tem_pasta:
+                    task_dir = os.path.join(base_dir, section, pasta, f"{suite} - {titulo}")
+                    os.makedirs(task_dir, exist_ok=True)
+                    for i in range(prints):
+                        _print_sintetico(*resolucao, rnd).save(os.path.join(task_dir, f"p{i:02d}.png"), optimize=False)
+                tarefas.append({"suite": str(suite), "titulo": titulo, "ordem": len(tarefas) + 1, "movidesk": str(90000 + suite), "tem_pasta": tem_pasta, "prints": prints})
+    return tarefas
+
+
+def criar_banco(caminho, projeto, tarefas):
+    """Cria um SQLite com as tabelas `utft`, `u_tk`, `ucom`, `usua`, `papelDoUser` e `unc` usadas pelas consultas."""
+    if os.path.exists(caminho): os.remove(caminho)
+    con = sqlite3.connect(caminho)
+    con.executescript('''
+        CREATE TABLE utft (task INTEGER, tk TEXT, tt TEXT, "or" INTEGER);
+        CREATE TABLE u_tk (ntk TEXT, identificador INTEGER);
+        CREATE TABLE ucom (task INTEGER, idusu INTEGER, tinc INTEGER);
+        CREATE TABLE usua (umUsuario INTEGER, uname TEXT);
+        CREATE TABLE papelDoUser (umUsuario INTEGER, identificador INTEGER, identificador2 INTEGER);
+        CREATE TABLE unc (ntk TEXT, resumo TEXT, dt_altera INTEGER);
+        CREATE INDEX ix_utft_tk ON utft (tk); CREATE INDEX ix_u_tk ON u_tk (identificador, ntk);
+        CREATE INDEX ix_ucom ON ucom (task, tinc); CREATE INDEX ix_unc ON unc (ntk, dt_altera);
+    ''')
+    con.executemany("INSERT INTO usua VALUES (?, ?)", [(ID_QA, "QA Sintético"), (ID_QA + 1, "Outro QA"), (ID_QA + 2, "Desenvolvedor")])
+    con.executemany("INSERT INTO papelDoUser VALUES (?, ?, ?)", [(ID_QA, projeto, ID_PAPEL_QA), (ID_QA + 1, projeto, ID_PAPEL_QA)])
+    for task, t in enumerate(tarefas, 1):
+        con.execute("INSERT INTO utft VALUES (?, ?, ?, ?)", (task, t["suite"], t["titulo"], t["ordem"]))
+        con.execute("INSERT INTO u_tk VALUES (?, ?)", (t["suite"], projeto))
+        # Um comentário de desenvolvedor antes do primeiro QA, para a janela (ROW_NUMBER) ter o que filtrar.
+        con.executemany("INSERT INTO ucom VALUES (?, ?, ?)", [(task, ID_QA + 2, 1), (task, ID_QA + task % 2, 2), (task, ID_QA, 3)])
+        con.executemany("INSERT INTO unc VALUES (?, ?, ?)", [(t["suite"], f"Movidesk: {t['movidesk']}", 1), (t["suite"], "Sem ticket", 2)])
+    con.commit()
+    con.close()
+
+
+class _CursorSQLite:
+    """Cursor com a interface usada do PyMySQL; traduz os marcadores `%s` e a coluna reservada `or`."""
+    def __init__(self, con): self._cur = con.cursor()
+    def __enter__(self): return self
+    def __exit__(self, *exc): self._cur.close()
+    def execute(self, sql, params=()): self._cur.execute(re.sub(r'\b(\w+)\.or\b', r'\1."or"', sql).replace('%s', '?'), params)
+    def fetchall(self): return self._cur.fetchall()
+    def fetchmany(self, n): return self._cur.fetchmany(n)
+    def fetchone(self): return self._cur.fetchone()
+
+
+class ConexaoSQLite:
+    """Conexão SQLite que se passa por uma conexão PyMySQL para `main._conectar_banco`."""
+    def __init__(self, caminho): self._con = sqlite3.connect(caminho, check_same_thread=False)
+    def cursor(self, classe=None): return _CursorSQLite(self._con)
+    def ping(self, reconnect=True): pass
+    def close(self): self._con.close()
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+
+class _HandlerMovidesk(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args): pass
+
+    def _responder(self, status, corpo, cabecalhos=None):
+        dados = json.dumps(corpo).encode()
+        self.send_response(status)
+        for chave, valor in (cabecalhos or {}).items(): self.send_header(chave, valor)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def _atrasar_ou_recusar(self):
+        """Aplica a latência configurada e, numa fração das requisições, responde 429."""
+        stub = self.server.stub
+        time.sleep(stub.latencia)
+        with stub.lock:
+            recusar = stub.rnd.random() < stub.fracao_429
+            stub.contagem["429" if recusar else self.command] += 1
+        if recusar: self._responder(429, {}, {"Retry-After": "0"})
+        return recusar
+
+    def do_GET(self):
+        if self._atrasar_ou_recusar(): return
+        consulta = parse_qs(urlparse(self.path).query)
+        ids = re.findall(r'id eq (\d+)', consulta.get("$filter", [""])[0])
+        top, skip = int(consulta.get("$top", ["100"])[0]), int(consulta.get("$skip", ["0"])[0])
+        itens = [{"id": int(i), "customFieldValues": [{"customFieldId": 1, "customFieldRuleId": 1, "value": f"valor {i}", "line": 1}]} for i in ids]
+        self._responder(200, itens[skip:skip + top])
+
+    def do_PATCH(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self._atrasar_ou_recusar(): return
+        self._responder(200, {})
+
+
+class StubMovidesk:
+    """Servidor HTTP local com os endpoints `GET/PATCH /tickets` usados pela distribuição.
+
+    `latencia` (segundos) é aplicada a cada requisição e `fracao_429` delas é recusada com 429.
+    """
+    def __init__(self, latencia=0.02, fracao_429=0.05, semente=42):
+        self.latencia, self.fracao_429 = latencia, fracao_429
+        self.rnd, self.lock = random.Random(semente), threading.Lock()
+        self.contagem = {"GET": 0, "PATCH": 0, "429": 0}
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", 0), _HandlerMovidesk)
+        self._servidor.daemon_threads = True
+        self._servidor.stub = self
+
+    @property
+    def url(self): return f"http://127.0.0.1:{self._servidor.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self._servidor.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._servidor.shutdown()
+        self._servidor.server_close()
@@ -38,4 +38,43 @@ def validar_configuracoes():
     if ausentes:
         print(f"\033[91mERRO: As seguintes variáveis de ambiente essenciais não foram definidas: {', '.join(ausentes)}\033[0m")
         print("\033[93mPor favor, copie o arquivo '.env.example' para '.env' e preencha com suas credenciais.\033[0m")
-        exit(1)
\ No newline at end of file
+        exit(1)
+
+# --- Desempenho ---
+# Processos usados para carimbar os prints da apresentação (0 = um por núcleo de CPU)
+STAMP_WORKERS = int(os.getenv("STAMP_WORKERS", 0))
+# Política de incorporação dos prints: resolução-alvo no slide (0 = mantém o original),
+# formato ('auto', 'png' ou 'jpeg') e qualidade mínima do JPEG
+EMBED_DPI = int(os.getenv("EMBED_DPI", 150))
+EMBED_FORMAT = os.getenv("EMBED_FORMAT", "auto").strip().lower()
+EMBED_JPEG_QUALITY = int(os.getenv("EMBED_JPEG_QUALITY", 85))
+# Tamanho máximo (MB) do cache em disco de prints já carimbados (0 = desativa o cache)
+PRINT_CACHE_MAX_MB = int(os.getenv("PRINT_CACHE_MAX_MB", 2048))
+# Reaproveita os slides inalterados da última apresentação gerada no mesmo modo/versão (1 = sim, 0 = não)
+PPTX_INCREMENTAL = os.getenv("PPTX_INCREMENTAL", "1").strip() not in ("0", "false", "False", "")
+# Grava cada slide (e suas imagens) no arquivo assim que fica pronto, mantendo a memória constante em
+# apresentações muito grandes; sempre refaz a apresentação do zero (1 = sim, 0 = não)
+PPTX_STREAMING = os.getenv("PPTX_STREAMING", "0").strip() not in ("0", "false", "False", "")
+# Gera a apresentação em fragmentos (um por pasta de versão), em processos paralelos, e depois os une (1 = sim, 0 = não)
+PPTX_SHARDS = os.getenv("PPTX_SHARDS", "0").strip() not in ("0", "false", "False", "")
+# Processos usados na geração em fragmentos (0 = um por núcleo de CPU)
+SHARD_WORKERS = int(os.getenv("SHARD_WORKERS", 0))
+# Leitura antecipada dos prints (útil quando a pasta de prints é um compartilhamento de rede): memória máxima
+# do buffer em MB (0 = desativa) e quantas leituras simultâneas
+PREFETCH_MB = int(os.getenv("PREFETCH_MB", 256))
+PREFETCH_THREADS = int(os.getenv("PREFETCH_THREADS", 4))
+# Perfila as etapas de cada ação (cProfile e tracemalloc) e salva em logs/ os perfis da mais lenta (1 = sim, 0 = não)
+PROFILE_SLOWEST_STAGE = os.getenv("PROFILE_SLOWEST_STAGE", "0").strip() not in ("0", "false", "False", "")
+# API do Movidesk: URL base (permite apontar para um servidor local de testes), requisições em paralelo,
+# limite de requisições por minuto (0 = sem limite) e número de novas tentativas em respostas 429/5xx
+MOVIDESK_API_URL = os.getenv("MOVIDESK_API_URL", "https://api.movidesk.com/public/v1")
+MOVIDESK_WORKERS = int(os.getenv("MOVIDESK_WORKERS", 8))
+MOVIDESK_RATE_LIMIT_PER_MINUTE = int(os.getenv("MOVIDESK_RATE_LIMIT_PER_MINUTE", 120))
+MOVIDESK_MAX_RETRIES = int(os.getenv("MOVIDESK_MAX_RETRIES", 4))
+# Por quantos segundos os dados de tickets pré-carregados do Movidesk são reaproveitados
+MOVIDESK_CACHE_TTL = int(os.getenv("MOVIDESK_CACHE_TTL", 900))
+# Quantos projetos são verificados em paralelo (cada um com sua conexão ao banco)
+VERIFY_WORKERS = int(os.getenv("VERIFY_WORKERS", 8))
+# Modo de acompanhamento das pendências: segundos entre conferências da pasta de prints e entre consultas ao banco
+WATCH_POLL_INTERVAL = float(os.getenv("WATCH_POLL_INTERVAL", 10))
+WATCH_DB_INTERVAL = float(os.getenv("WATCH_DB_INTERVAL", 300))
@@ -2,23 +2,27 @@
 
 # Imports de bibliotecas padrão
 import os
+import io
+import hashlib
 import csv
 import json
-import tempfile
 import logging
 import platform
 import re
+import itertools
+import time
+import random
+import threading
+import queue
+import argparse
+import sys
+import contextlib
+import copy
+from collections import Counter, deque, namedtuple
+from functools import lru_cache
 
-# Imports de bibliotecas externas
-import pymysql
-import requests
-from PIL import Image, ImageDraw, ImageFont
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.enum.text import PP_ALIGN
-from pptx.oxml import parse_xml
-from pptx.oxml.xmlchemy import OxmlElement
-from pptx.dml.color import RGBColor
+# As bibliotecas externas (pymysql, requests, Pillow, python-pptx) são importadas dentro das funções
+# que as usam, para que o menu abra rápido e cada ação carregue apenas o que precisa.
 
 # Importa as variáveis de configuração do nosso arquivo config.py
 from config import (
@@ -26,7 +30,10 @@ from config import (
     TRAINING_ASSETS_BASE_PATH, MOVIDESK_API_TOKEN,
     MOVIDESK_VERSION_FIELD_ID, MOVIDESK_OTHER_FIELD_ID, MOVIDESK_OTHER_FIELD_RULE_ID,
     MOVIDESK_OWNER_ID, MOVIDESK_OWNER_TEAM_NAME, MOVIDESK_ACTION_CREATOR_ID,
-    ACTION_HTML_SIGNATURE, validar_configuracoes
+    ACTION_HTML_SIGNATURE, STAMP_WORKERS, EMBED_DPI, EMBED_FORMAT, EMBED_JPEG_QUALITY,
+    PRINT_CACHE_MAX_MB, PPTX_INCREMENTAL, PPTX_STREAMING, PPTX_SHARDS, SHARD_WORKERS, PREFETCH_MB, PREFETCH_THREADS, PROFILE_SLOWEST_STAGE,
+    VERIFY_WORKERS, WATCH_POLL_INTERVAL, WATCH_DB_INTERVAL, MOVIDESK_API_URL, MOVIDESK_WORKERS, MOVIDESK_RATE_LIMIT_PER_MINUTE, MOVIDESK_MAX_RETRIES, MOVIDESK_CACHE_TTL,
+    validar_configuracoes
 )
 
 
@@ -36,6 +43,11 @@ LOGS_DIR = "logs"
 RELATORIOS_DIR = "relatorios"
 PPTX_DIR = "powerpoint"
 PPTX_TEMPLATE_PATH = "Layout-Base.pptx"
+CACHE_PRINTS_DIR = "cache_prints"
+EXTENSOES_PRINT = ('.png', '.jpg', '.jpeg')
+EMU_POR_POLEGADA = 914400
+# Fração do slide ocupada, no máximo, por cada print
+LARGURA_MAX_PRINT, ALTURA_MAX_PRINT = 0.8, 0.7
 
 class Cores:
     """Classe para armazenar códigos de cores ANSI para o terminal."""
@@ -74,48 +86,395 @@ class ErrorFilter(logging.Filter):
     def filter(self, record):
         return record.levelno >= logging.ERROR
 
-# Configuração do Logger
-logger = logging.getLogger('dist')
-logger.setLevel(logging.DEBUG)
-fh_all = logging.FileHandler(os.path.join(LOGS_DIR, 'distribuicao_tickets.log'), 'w', 'utf-8')
-fh_all.setLevel(logging.DEBUG)
-fh_all.setFormatter(logging.Formatter('%(asctime)s | %(levelname)s | %(message)s'))
-logger.addHandler(fh_all)
-fh_succ = logging.FileHandler(os.path.join(LOGS_DIR, 'tickets_success.txt'), 'w', 'utf-8')
-fh_succ.setLevel(logging.INFO)
-fh_succ.addFilter(SuccessFilter())
-fh_succ.setFormatter(logging.Formatter('%(message)s'))
-logger.addHandler(fh_succ)
-fh_err = logging.FileHandler(os.path.join(LOGS_DIR, 'tickets_error.txt'), 'w', 'utf-8')
-fh_err.setLevel(logging.ERROR)
-fh_err.addFilter(ErrorFilter())
-fh_err.setFormatter(logging.Formatter('%(message)s'))
-logger.addHandler(fh_err)
+def configurar_logger():
+    """Cria os arquivos de log da distribuição (uma única vez por execução) e retorna o logger."""
+    log = logging.getLogger('dist')
+    if log.handlers: return log
+    os.makedirs(LOGS_DIR, exist_ok=True)
+    log.setLevel(logging.DEBUG)
+    fh_all = logging.FileHandler(os.path.join(LOGS_DIR, 'distribuicao_tickets.log'), 'w', 'utf-8')
+    fh_all.setLevel(logging.DEBUG)
+    fh_all.setFormatter(logging.Formatter('%(asctime)s | %(levelname)s | %(message)s'))
+    log.addHandler(fh_all)
+    fh_succ = logging.FileHandler(os.path.join(LOGS_DIR, 'tickets_success.txt'), 'w', 'utf-8')
+    fh_succ.setLevel(logging.INFO)
+    fh_succ.addFilter(SuccessFilter())
+    fh_succ.setFormatter(logging.Formatter('%(message)s'))
+    log.addHandler(fh_succ)
+    fh_err = logging.FileHandler(os.path.join(LOGS_DIR, 'tickets_error.txt'), 'w', 'utf-8')
+    fh_err.setLevel(logging.ERROR)
+    fh_err.addFilter(ErrorFilter())
+    fh_err.setFormatter(logging.Formatter('%(message)s'))
+    log.addHandler(fh_err)
+    log.debug('Logger inicializado.')
+    return log
+
+class _LoggerSobDemanda:
+    """Encaminha as chamadas para o logger 'dist', configurando-o no primeiro uso (e não na importação)."""
+    def __getattr__(self, nome): return getattr(configurar_logger(), nome)
+
+logger = _LoggerSobDemanda()
+
+# --- MÉTRICAS E PERFIL DE EXECUÇÃO ---
+class Metricas:
+    """Duração, número de chamadas e bytes de cada etapa de uma ação, gravados em JSON em logs/ ao final.
+
+    Etapas executadas em paralelo (threads ou processos) têm as durações somadas, não o tempo de parede.
+    Com `perfil`, as etapas medidas com `etapa` também são perfiladas (cProfile e tracemalloc, uma de cada
+    vez) e, ao salvar, são gravados os perfis da invocação mais lenta da etapa que mais consumiu tempo.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.iniciar("sessao")
+
+    def iniciar(self, acao, perfil=False):
+        self.acao, self.perfil = acao, perfil
+        self.inicio = time.time()
+        self.etapas = {}
+        self._perfis = {}  # etapa -> (segundos, pstats.Stats, snapshot do tracemalloc, pico de memória)
+        self._perfilando = False
+        if perfil:
+            import tracemalloc
+            tracemalloc.start()
+
+    def registrar(self, nome, segundos, chamadas=1, bytes_=0):
+        with self._lock:
+            etapa = self.etapas.setdefault(nome, {"segundos": 0.0, "chamadas": 0, "bytes": 0})
+            etapa["segundos"] += segundos
+            etapa["chamadas"] += chamadas
+            etapa["bytes"] += bytes_
+
+    @contextlib.contextmanager
+    def etapa(self, nome):
+        """Mede o bloco como uma chamada da etapa `nome`; o bloco pode informar os bytes em `medida["bytes"]`."""
+        medida, perfil = {"bytes": 0}, None
+        if self.perfil:
+            with self._lock:
+                if not self._perfilando: self._perfilando = perfil = True
+            if perfil:
+                import cProfile, tracemalloc
+                tracemalloc.reset_peak()
+                perfil = cProfile.Profile()
+                perfil.enable()
+        inicio = time.perf_counter()
+        try:
+            yield medida
+        finally:
+            segundos = time.perf_counter() - inicio
+            if perfil:
+                perfil.disable()
+                self._guardar_perfil(nome, segundos, perfil)
+            self.registrar(nome, segundos, bytes_=medida["bytes"])
+
+    def _guardar_perfil(self, nome, segundos, perfil):
+        import pstats, tracemalloc
+        try:
+            if segundos > self._perfis.get(nome, (0,))[0]:
+                self._perfis[nome] = (segundos, pstats.Stats(perfil), tracemalloc.take_snapshot(), tracemalloc.get_traced_memory()[1])
+        finally:
+            with self._lock: self._perfilando = False
+
+    def salvar(self):
+        """Grava logs/metricas_<ação>_<data>.json (e, no modo perfil, os perfis da etapa mais lenta) e retorna o caminho do JSON."""
+        base = os.path.join(LOGS_DIR, f"metricas_{self.acao}_{time.strftime('%Y%m%d_%H%M%S', time.localtime(self.inicio))}_{int(self.inicio * 1000) % 1000:03d}")
+        dados = {"acao": self.acao, "inicio": time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.inicio)),
+                 "duracao_total": round(time.time() - self.inicio, 3),
+                 "etapas": {nome: {**etapa, "segundos": round(etapa["segundos"], 4)} for nome, etapa in sorted(self.etapas.items(), key=lambda item: -item[1]["segundos"])}}
+        os.makedirs(LOGS_DIR, exist_ok=True)
+        if self.perfil:
+            import tracemalloc
+            if self._perfis:
+                nome = max(self._perfis, key=lambda n: self.etapas[n]["segundos"])
+                segundos, stats, snapshot, pico = self._perfis[nome]
+                stats.dump_stats(f"{base}_perfil_{nome}.prof")
+                with open(f"{base}_perfil_{nome}.txt", 'w', encoding='utf-8') as f:
+                    stats.stream = f
+                    stats.sort_stats('cumulative').print_stats(40)
+                    f.write(f"\n--- tracemalloc: pico de {_formatar_bytes(pico)} durante a etapa; maiores alocações vivas ao seu fim ---\n")
+                    for estatistica in snapshot.statistics('lineno')[:25]: f.write(f"{estatistica}\n")
+                dados["perfil"] = {"etapa": nome, "segundos_invocacao": round(segundos, 3), "pico_memoria": pico, "arquivo": f"{base}_perfil_{nome}.prof"}
+            tracemalloc.stop()
+        with open(f"{base}.json", 'w', encoding='utf-8') as f: json.dump(dados, f, ensure_ascii=False, indent=2)
+        return f"{base}.json"
+
+METRICAS = Metricas()
+
+@contextlib.contextmanager
+def medir_acao(acao, perfil=PROFILE_SLOWEST_STAGE):
+    """Zera as métricas para a ação e as grava ao final, mesmo se ela falhar."""
+    METRICAS.iniciar(acao, perfil)
+    try:
+        yield METRICAS
+    finally:
+        print(f"Métricas da execução salvas em '{METRICAS.salvar()}'.")
 
 # --- FUNÇÕES DE MANIPULAÇÃO DE IMAGEM E PPTX ---
-def add_order_to_image(image_path, order, total, margin=20):
-    """Adiciona texto de ordem no canto inferior direito da imagem."""
+@lru_cache(maxsize=None)
+def _carregar_fonte(font_size):
+    """Carrega a fonte do carimbo uma única vez por tamanho (e por processo)."""
+    from PIL import ImageFont
+    try: return ImageFont.truetype("arial.ttf", font_size)
+    except IOError: return ImageFont.load_default()
+
+# Política de incorporação: `dpi` define a resolução-alvo no slide (0 = mantém o original),
+# `formato` é 'auto', 'png' ou 'jpeg' e `qualidade_jpeg` limita a perda do JPEG.
+PoliticaImagem = namedtuple('PoliticaImagem', 'dpi formato qualidade_jpeg')
+POLITICA_IMAGEM = PoliticaImagem(EMBED_DPI, EMBED_FORMAT, EMBED_JPEG_QUALITY)
+
+def caixa_do_print(prs, politica):
+    """Retorna o tamanho máximo em pixels que um print precisa ter no slide, ou None se não houver limite."""
+    if not politica.dpi: return None
+    return (int(prs.slide_width * LARGURA_MAX_PRINT / EMU_POR_POLEGADA * politica.dpi),
+            int(prs.slide_height * ALTURA_MAX_PRINT / EMU_POR_POLEGADA * politica.dpi))
+
+def _codificar_png(img, cores, opcoes):
+    """Codifica em PNG; com `cores`, paletizado com exatamente essas cores (tons fora delas vão para a mais próxima)."""
+    from PIL import Image
+    if cores:
+        paleta = Image.new('P', (1, 1))
+        paleta.putpalette([canal for _, cor in cores for canal in cor])
+        img = img.quantize(palette=paleta, dither=Image.Dither.NONE)
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG', **opcoes)
+    return buffer.getvalue()
+
+def _codificar_imagem(img, politica, cores_origem=None, reduzida=False):
+    """Codifica a imagem conforme a política e retorna os bytes.
+
+    O PNG é paletizado quando a imagem cabe em 256 cores. Numa imagem reduzida a reamostragem cria tons
+    intermediários, então a paleta vem das cores do print original (`cores_origem`). No formato 'auto'
+    são gerados o PNG e o JPEG e fica o menor; sem redução, o PNG comum (o que seria gravado sem a
+    política) também concorre, então o print nunca fica maior do que seria sem ela.
+    """
+    opcoes = {'dpi': (politica.dpi, politica.dpi)} if politica.dpi else {}
+    candidatos = []
+    if politica.formato != 'jpeg':
+        cores = img.getcolors(256) or (cores_origem if reduzida else None)
+        candidatos.append(_codificar_png(img, cores, opcoes))
+        if cores and not reduzida: candidatos.append(_codificar_png(img, None, opcoes))
+    if politica.formato != 'png':
+        buffer = io.BytesIO()
+        img.save(buffer, format='JPEG', quality=politica.qualidade_jpeg, optimize=True, **opcoes)
+        candidatos.append(buffer.getvalue())
+    return min(candidatos, key=len)
+
+def _desenhar_ordem(img, order, total, margin):
+    """Desenha o texto de ordem no canto inferior direito da imagem (em `img` mesmo)."""
+    from PIL import ImageDraw
+    draw = ImageDraw.Draw(img)
+    font = _carregar_fonte(max(20, int(max(img.width, img.height) * 0.01)))
+    text = f"{order}/{total}".strip()
+    text_bbox = draw.textbbox((0, 0), text, font=font)
+    text_width = text_bbox[2] - text_bbox[0]
+    text_height = text_bbox[3] - text_bbox[1]
+    x = max(margin, img.width - text_width - margin)
+    y = max(margin, img.height - text_height - margin)
+    padding = 5
+    draw.rectangle([(x - padding, y), (x + text_width + padding, y + text_height + padding)], fill=(0, 0, 0))
+    draw.text((x, y), text, font=font, fill=(255, 255, 255))
+    return img
+
+def add_order_to_image(image_path, order, total, margin=20, caixa=None, politica=POLITICA_IMAGEM):
+    """Adiciona texto de ordem no canto inferior direito da imagem e retorna a imagem codificada em memória.
+
+    Se `caixa` (largura, altura em pixels) for informada, a imagem é reduzida para caber nela antes do carimbo.
+    Quando a versão reduzida fica maior que o arquivo de origem (a reamostragem atrapalha a compressão de
+    prints com poucas cores), o print também é carimbado no tamanho original e fica a menor das duas
+    codificações; no slide ele ocupa o mesmo espaço.
+    """
+    from PIL import Image
+    tamanho_origem = image_path.getbuffer().nbytes if isinstance(image_path, io.BytesIO) else os.path.getsize(image_path)
     with Image.open(image_path) as img:
         if img.mode != 'RGB': img = img.convert('RGB')
-        draw = ImageDraw.Draw(img)
-        font_size = max(20, int(max(img.width, img.height) * 0.01))
-        try: font = ImageFont.truetype("arial.ttf", font_size)
-        except IOError: font = ImageFont.load_default()
-        text = f"{order}/{total}".strip()
-        text_bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = text_bbox[2] - text_bbox[0]
-        text_height = text_bbox[3] - text_bbox[1]
-        x = max(margin, img.width - text_width - margin)
-        y = max(margin, img.height - text_height - margin)
-        padding = 5
-        draw.rectangle([(x - padding, y), (x + text_width + padding, y + text_height + padding)], fill=(0, 0, 0))
-        draw.text((x, y), text, font=font, fill=(255, 255, 255))
-        temp_file = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
-        img.save(temp_file.name)
-        return temp_file.name
-
-def add_slide_with_title(prs, layout, title, version, tickets_data):
+        if caixa and (img.width > caixa[0] or img.height > caixa[1]):
+            # As cores do original (mais as do carimbo) viram a paleta do PNG reduzido; ver `_codificar_imagem`.
+            cores_origem = img.getcolors(254) if politica.formato != 'jpeg' else None
+            if cores_origem:
+                cores_origem += [(0, (0, 0, 0)), (0, (255, 255, 255))]
+            reduzida = img.copy()
+            reduzida.thumbnail(caixa, Image.LANCZOS)
+            dados = _codificar_imagem(_desenhar_ordem(reduzida, order, total, margin), politica, cores_origem, reduzida=True)
+            if len(dados) <= tamanho_origem: return dados
+            return min(dados, _codificar_imagem(_desenhar_ordem(img, order, total, margin), politica), key=len)
+        return _codificar_imagem(_desenhar_ordem(img, order, total, margin), politica)
+
+class CachePrints:
+    """Cache em disco dos prints carimbados, endereçado pelo conteúdo do arquivo de origem.
+
+    A chave combina o hash do arquivo, a ordem/total do carimbo e as configurações de renderização,
+    então qualquer modo (F/L/A/P) que precise do mesmo print reaproveita o resultado. O mtime de cada
+    entrada marca o último uso, e `podar` remove as menos usadas quando o limite de tamanho é excedido.
+    """
+    VERSAO = 3  # Incrementar quando o desenho do carimbo mudar, para invalidar o cache antigo.
+
+    def __init__(self, diretorio, limite_bytes):
+        self.diretorio = diretorio
+        self.limite_bytes = limite_bytes
+
+    @property
+    def ativo(self): return self.limite_bytes > 0
+
+    def chave(self, hash_conteudo, order, total, caixa, politica):
+        """Chave da entrada; `hash_conteudo` é o SHA-256 (digest) do arquivo de origem."""
+        configuracao = f"{self.VERSAO}|{order}/{total}|{caixa}|{tuple(politica)}".encode()
+        return hashlib.sha256(hash_conteudo + configuracao).hexdigest()
+
+    def _caminho(self, chave): return os.path.join(self.diretorio, chave[:2], chave)
+
+    def obter(self, chave):
+        """Retorna os bytes da entrada (renovando seu uso) ou None se ela não existir."""
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, 'rb') as f: dados = f.read()
+            os.utime(caminho)
+            return dados
+        except OSError:
+            return None
+
+    def guardar(self, chave, dados):
+        caminho = self._caminho(chave)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, 'wb') as f: f.write(dados)
+        os.replace(temporario, caminho)
+
+    def podar(self):
+        """Remove as entradas usadas há mais tempo até o cache caber no limite configurado."""
+        if not self.ativo or not os.path.isdir(self.diretorio): return
+        entradas, total = [], 0
+        for subdir in os.scandir(self.diretorio):
+            if not subdir.is_dir(): continue
+            for entrada in os.scandir(subdir.path):
+                # Outro processo (um fragmento em paralelo, outra sessão) pode ter removido a entrada.
+                with contextlib.suppress(OSError):
+                    st = entrada.stat()
+                    entradas.append((st.st_mtime, st.st_size, entrada.path))
+                    total += st.st_size
+        for _, tamanho, caminho in sorted(entradas):
+            if total <= self.limite_bytes: break
+            with contextlib.suppress(OSError): os.remove(caminho)
+            total -= tamanho
+
+CACHE_PRINTS = CachePrints(CACHE_PRINTS_DIR, PRINT_CACHE_MAX_MB * 1024 * 1024)
+
+# Resultado de um carimbo: a imagem codificada, o tamanho e o SHA-256 do arquivo original, se veio do cache e quanto levou.
+PrintCarimbado = namedtuple('PrintCarimbado', 'dados tamanho_original sha256 do_cache segundos')
+
+def _carimbar(job):
+    """Ponto de entrada dos processos do pool: job = (caminho ou conteúdo já lido, ordem, total, caixa, política)."""
+    origem, order, total, caixa, politica = job
+    inicio = time.perf_counter()
+    if isinstance(origem, bytes): conteudo = origem
+    else:
+        with open(origem, 'rb') as f: conteudo = f.read()
+    # O hash serve à chave do cache e ao manifesto, que assim não precisa ler o print de novo.
+    hash_conteudo = hashlib.sha256(conteudo)
+    if not CACHE_PRINTS.ativo:
+        dados = add_order_to_image(io.BytesIO(conteudo), order, total, caixa=caixa, politica=politica)
+        return PrintCarimbado(dados, len(conteudo), hash_conteudo.hexdigest(), False, time.perf_counter() - inicio)
+    chave = CACHE_PRINTS.chave(hash_conteudo.digest(), order, total, caixa, politica)
+    if (dados := CACHE_PRINTS.obter(chave)) is not None:
+        return PrintCarimbado(dados, len(conteudo), hash_conteudo.hexdigest(), True, time.perf_counter() - inicio)
+    dados = add_order_to_image(io.BytesIO(conteudo), order, total, caixa=caixa, politica=politica)
+    CACHE_PRINTS.guardar(chave, dados)
+    return PrintCarimbado(dados, len(conteudo), hash_conteudo.hexdigest(), False, time.perf_counter() - inicio)
+
+def carimbar_prints(jobs, executor=None, janela=8, contagem=None):
+    """Carimba os prints de `jobs` e os devolve na mesma ordem, com no máximo `janela` tarefas em voo no pool.
+
+    Se `contagem` (um Counter) for informada, acumula nela os acertos e falhas do cache.
+    """
+    jobs = iter(jobs)
+    if executor is None:
+        resultados = map(_carimbar, jobs)
+    else:
+        def _resultados_do_pool():
+            pendentes = deque(executor.submit(_carimbar, job) for job in itertools.islice(jobs, janela))
+            while pendentes:
+                resultado = pendentes.popleft().result()
+                if (job := next(jobs, None)) is not None: pendentes.append(executor.submit(_carimbar, job))
+                yield resultado
+        resultados = _resultados_do_pool()
+    for resultado in resultados:
+        METRICAS.registrar("pillow_carimbo", resultado.segundos, bytes_=resultado.tamanho_original)
+        if contagem is not None: contagem['cache_acertos' if resultado.do_cache else 'cache_falhas'] += 1
+        yield resultado
+
+class LeituraAntecipada:
+    """Lê arquivos em segundo plano, na ordem em que serão consumidos, com até `limite_bytes` em memória.
+
+    Iterar sobre a instância devolve o conteúdo de cada arquivo, na ordem de `caminhos`. Assim a leitura
+    dos próximos prints (na pasta de rede) se sobrepõe ao carimbo dos atuais. São contados os arquivos que
+    já estavam prontos ao serem pedidos, o tempo total de espera e o pico de memória do buffer.
+    """
+    def __init__(self, caminhos, limite_bytes, threads=4):
+        self._caminhos = list(caminhos)
+        self.limite_bytes = limite_bytes
+        self._prontos = {}  # posição -> conteúdo (ou a exceção da leitura)
+        self._proxima_leitura = self._proxima_entrega = 0
+        self._em_memoria = self.pico_memoria = 0
+        self._encerrado = False
+        self._cond = threading.Condition()
+        self.acertos = self.esperas = 0
+        self.tempo_parado = 0.0
+        self._threads = [threading.Thread(target=self._ler, daemon=True) for _ in range(max(1, min(threads, len(self._caminhos))))]
+        for t in self._threads: t.start()
+
+    def _ler(self):
+        while True:
+            with self._cond:
+                # A posição aguardada pelo consumidor é sempre lida, mesmo com o buffer cheio, para não travar.
+                self._cond.wait_for(lambda: self._encerrado or self._proxima_leitura >= len(self._caminhos) or
+                                    self._em_memoria < self.limite_bytes or self._proxima_leitura == self._proxima_entrega)
+                if self._encerrado or self._proxima_leitura >= len(self._caminhos): return
+                pos = self._proxima_leitura
+                self._proxima_leitura += 1
+            inicio = time.perf_counter()
+            try:
+                with open(self._caminhos[pos], 'rb') as f: conteudo = f.read()
+            except OSError as e: conteudo = e
+            METRICAS.registrar("leitura_prints", time.perf_counter() - inicio, bytes_=len(conteudo) if isinstance(conteudo, bytes) else 0)
+            with self._cond:
+                self._prontos[pos] = conteudo
+                if isinstance(conteudo, bytes):
+                    self._em_memoria += len(conteudo)
+                    self.pico_memoria = max(self.pico_memoria, self._em_memoria)
+                self._cond.notify_all()
+
+    def __iter__(self):
+        for pos in range(len(self._caminhos)):
+            with self._cond:
+                if pos in self._prontos: self.acertos += 1
+                else:
+                    self.esperas += 1
+                    inicio = time.perf_counter()
+                    self._cond.wait_for(lambda: pos in self._prontos)
+                    self.tempo_parado += time.perf_counter() - inicio
+                conteudo = self._prontos.pop(pos)
+                self._proxima_entrega = pos + 1
+                if isinstance(conteudo, bytes): self._em_memoria -= len(conteudo)
+                self._cond.notify_all()
+            if isinstance(conteudo, OSError): raise conteudo
+            yield conteudo
+        METRICAS.registrar("leitura_prints_espera", self.tempo_parado, chamadas=self.esperas)
+
+    def fechar(self):
+        with self._cond:
+            self._encerrado = True
+            self._cond.notify_all()
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.fechar()
+
+    def resumo(self):
+        total = self.acertos + self.esperas
+        return (f"Leitura antecipada: {self.acertos}/{total} prints prontos a tempo ({self.acertos / total:.0%}), "
+                f"{self.tempo_parado:.2f}s de espera, pico de {_formatar_bytes(self.pico_memoria)} em memória") if total else None
+
+def add_slide_with_title(prs, layout, title, version, movidesk="N/A"):
     """Adiciona um slide com título e versão."""
+    from pptx.dml.color import RGBColor
+    from pptx.util import Inches, Pt
     slide = prs.slides.add_slide(layout)
     for shape in slide.shapes:
         if shape.is_placeholder and shape.placeholder_format.idx == 1:
@@ -140,15 +499,14 @@ def add_slide_with_title(prs, layout, title, version, tickets_data):
     p.font.bold = False
     p.font.name = "Roboto"
     text_frame.word_wrap = True
-    add_footer_texts(slide, title, tickets_data, prs)
+    add_footer_texts(slide, movidesk, prs)
     return slide
 
-def add_footer_texts(slide, titulo, tickets_data, prs):
+def add_footer_texts(slide, movidesk, prs):
     """Adiciona os textos de rodapé ao slide."""
-    parts = titulo.split(' - ', 1)
-    suite_id = parts[0].strip()
-    ticket_info = tickets_data.get(suite_id, {"movidesk": "N/A", "ordem": "N/A"})
-    movidesk_text = f"Movidesk: {ticket_info['movidesk']}"
+    from pptx.enum.text import PP_ALIGN
+    from pptx.util import Inches, Pt
+    movidesk_text = f"Movidesk: {movidesk}"
     left_textbox = slide.shapes.add_textbox(Inches(0.5), prs.slide_height - Inches(0.6), Inches(4), Inches(0.5))
     left_text_frame = left_textbox.text_frame
     left_text_frame.clear()
@@ -159,103 +517,474 @@ def add_footer_texts(slide, titulo, tickets_data, prs):
     p_left.alignment = PP_ALIGN.LEFT
     left_text_frame.word_wrap = True
 
-def add_images_with_animation(prs, layout, title, version, img_paths, tickets_data):
-    """Adiciona múltiplos prints e aplica a sequência de animação."""
-    slide = add_slide_with_title(prs, layout, title, version, tickets_data)
-    if not img_paths: return
+def add_images_with_animation(prs, layout, title, version, img_paths, movidesk="N/A", carimbados=None):
+    """Adiciona múltiplos prints e aplica a sequência de animação.
+
+    `carimbados` é um iterador compartilhado de prints já carimbados (ver `carimbar_prints`);
+    quando omitido, os prints são carimbados aqui mesmo, em série.
+    Retorna a soma dos bytes originais e dos bytes efetivamente incorporados ao slide.
+    """
+    from pptx.oxml.xmlchemy import OxmlElement
+    slide = add_slide_with_title(prs, layout, title, version, movidesk)
+    if not img_paths: return 0, 0
     slide_width, slide_height = prs.slide_width, prs.slide_height
     total_images = len(img_paths)
+    if carimbados is None:
+        caixa = caixa_do_print(prs, POLITICA_IMAGEM)
+        carimbados = carimbar_prints((p, idx + 1, total_images, caixa, POLITICA_IMAGEM) for idx, p in enumerate(img_paths))
     image_shapes = []
-    for idx, img_path in enumerate(img_paths):
-        temp_image_path = None
-        try:
-            temp_image_path = add_order_to_image(img_path, idx + 1, total_images)
-            pic = slide.shapes.add_picture(temp_image_path, 0, 0)
-            max_width, max_height = slide_width * 0.8, slide_height * 0.7
-            pic.width, pic.height = _calculate_new_dimensions(pic.width, pic.height, max_width, max_height)
-            pic.left, pic.top = (slide_width - pic.width) // 2, (slide_height - pic.height) // 2
-            if idx > 0: pic.element.spPr.append(parse_xml('<a:noFill xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"/>'))
-            image_shapes.append(pic)
-        finally:
-            if temp_image_path and os.path.exists(temp_image_path): os.unlink(temp_image_path)
-    if total_images <= 1: return
-    main_sequence = _get_or_create_main_sequence(slide)
-    id_counter = IdCounter(10)
-    for i in range(total_images - 1):
-        exit_node = _create_animation_node(image_shapes[i].shape_id, 'exit', 'clickEffect', id_counter)
-        appear_node = _create_animation_node(image_shapes[i+1].shape_id, 'appear', 'afterEffect', id_counter)
-        main_sequence.append(_create_click_group(exit_node, appear_node, id_counter))
+    bytes_originais = bytes_incorporados = 0
+    for idx, carimbado in enumerate(itertools.islice(carimbados, total_images)):
+        bytes_originais += carimbado.tamanho_original
+        bytes_incorporados += len(carimbado.dados)
+        pic = slide.shapes.add_picture(io.BytesIO(carimbado.dados), 0, 0)
+        max_width, max_height = slide_width * LARGURA_MAX_PRINT, slide_height * ALTURA_MAX_PRINT
+        pic.width, pic.height = _calculate_new_dimensions(pic.width, pic.height, max_width, max_height)
+        pic.left, pic.top = (slide_width - pic.width) // 2, (slide_height - pic.height) // 2
+        if idx > 0: pic.element.spPr.append(OxmlElement('a:noFill'))
+        image_shapes.append(pic)
+    if total_images > 1:
+        with METRICAS.etapa("lxml_animacao"): _adicionar_sequencia_animacao(slide, [pic.shape_id for pic in image_shapes])
+    return bytes_originais, bytes_incorporados
 
 def _calculate_new_dimensions(img_width, img_height, max_width, max_height):
     ratio = min(max_width / img_width, max_height / img_height) if img_width > 0 and img_height > 0 else 0
     return int(img_width * ratio), int(img_height * ratio)
 
+# Modelos da árvore de animação, interpretados uma única vez e clonados para cada slide/clique.
+_XML_TIMING = '<p:timing xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main"><p:tnLst><p:par><p:cTn id="1" dur="indefinite" nodeType="tmRoot"><p:childTnLst><p:seq concurrent="1" nextAc="seek"><p:cTn id="2" dur="indefinite" nodeType="mainSeq"><p:childTnLst/></p:cTn><p:prevCondLst><p:cond evt="onPrev"><p:tgtEl><p:sldTgt/></p:tgtEl></p:cond></p:prevCondLst><p:nextCondLst><p:cond evt="onNext"><p:tgtEl><p:sldTgt/></p:tgtEl></p:cond></p:nextCondLst></p:seq></p:childTnLst></p:cTn></p:par></p:tnLst></p:timing>'
+_XML_EFEITO = '<p:par><p:cTn id="0" fill="hold" nodeType="{node_type}" presetClass="{preset}" presetID="1" presetSubtype="0"><p:stCondLst><p:cond delay="0"/></p:stCondLst><p:childTnLst><p:set><p:cBhvr><p:cTn id="0" dur="1" fill="hold"><p:stCondLst><p:cond delay="0"/></p:stCondLst></p:cTn><p:tgtEl><p:spTgt spid="0"/></p:tgtEl><p:attrNameLst><p:attrName>style.visibility</p:attrName></p:attrNameLst></p:cBhvr><p:to><p:strVal val="{visibility}"/></p:to></p:set></p:childTnLst></p:cTn></p:par>'
+# Um clique: esconde o print atual (clickEffect) e, em seguida, mostra o próximo (afterEffect).
+_XML_CLIQUE = ('<p:par xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main"><p:cTn id="0" fill="hold"><p:stCondLst><p:cond delay="indefinite"/></p:stCondLst><p:childTnLst><p:par><p:cTn id="0" fill="hold"><p:stCondLst><p:cond delay="0"/></p:stCondLst><p:childTnLst>'
+               + _XML_EFEITO.format(node_type='clickEffect', preset='exit', visibility='hidden')
+               + _XML_EFEITO.format(node_type='afterEffect', preset='entr', visibility='visible')
+               + '</p:childTnLst></p:cTn></p:par></p:childTnLst></p:cTn></p:par>')
+# Deslocamento do id de cada cTn do clique, na ordem do documento (grupo, passo, saída, comportamento,
+# entrada, comportamento): os efeitos recebem os primeiros ids do bloco, como sempre receberam.
+OFFSETS_IDS_CLIQUE = (4, 5, 0, 1, 2, 3)
+
+@lru_cache(maxsize=None)
+def _modelo_xml(xml):
+    from pptx.oxml import parse_xml
+    return parse_xml(xml)
+
 def _get_or_create_main_sequence(slide):
     timing = slide.element.find('.//p:timing', slide.element.nsmap)
     if timing is None:
-        timing = parse_xml('<p:timing xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main"><p:tnLst><p:par><p:cTn id="1" dur="indefinite" nodeType="tmRoot"><p:childTnLst><p:seq concurrent="1" nextAc="seek"><p:cTn id="2" dur="indefinite" nodeType="mainSeq"><p:childTnLst/></p:cTn><p:prevCondLst><p:cond evt="onPrev"><p:tgtEl><p:sldTgt/></p:tgtEl></p:cond></p:prevCondLst><p:nextCondLst><p:cond evt="onNext"><p:tgtEl><p:sldTgt/></p:tgtEl></p:cond></p:nextCondLst></p:seq></p:childTnLst></p:cTn></p:par></p:tnLst></p:timing>')
+        timing = copy.deepcopy(_modelo_xml(_XML_TIMING))
         slide.element.append(timing)
     return timing.find('.//p:cTn[@nodeType="mainSeq"]/p:childTnLst', slide.element.nsmap)
 
-def _create_click_group(exit_anim_node, appear_anim_node, id_counter):
-    click_group_node = parse_xml(f'<p:par xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main"><p:cTn id="{id_counter.get()}" fill="hold"><p:stCondLst><p:cond delay="indefinite"/></p:stCondLst><p:childTnLst><p:par><p:cTn id="{id_counter.increment()}" fill="hold"><p:stCondLst><p:cond delay="0"/></p:stCondLst><p:childTnLst/></p:cTn></p:par></p:childTnLst></p:cTn></p:par>')
-    id_counter.increment()
-    anim_list_parent = click_group_node.find('.//p:cTn/p:childTnLst/p:par/p:cTn/p:childTnLst', click_group_node.nsmap)
-    anim_list_parent.append(exit_anim_node)
-    anim_list_parent.append(appear_anim_node)
-    return click_group_node
-
-def _create_animation_node(shape_id, effect, node_type, id_counter):
-    visibility = "visible" if effect == 'appear' else "hidden"
-    preset = "entr" if effect == 'appear' else "exit"
-    anim_node = parse_xml(f'<p:par xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main"><p:cTn id="{id_counter.get()}" fill="hold" nodeType="{node_type}" presetClass="{preset}" presetID="1" presetSubtype="0"><p:stCondLst><p:cond delay="0"/></p:stCondLst><p:childTnLst><p:set><p:cBhvr><p:cTn id="{id_counter.get()+1}" dur="1" fill="hold"><p:stCondLst><p:cond delay="0"/></p:stCondLst></p:cTn><p:tgtEl><p:spTgt spid="{shape_id}"/></p:tgtEl><p:attrNameLst><p:attrName>style.visibility</p:attrName></p:attrNameLst></p:cBhvr><p:to><p:strVal val="{visibility}"/></p:to></p:set></p:childTnLst></p:cTn></p:par>')
-    id_counter.increment(2)
-    return anim_node
+def _adicionar_sequencia_animacao(slide, shape_ids, id_counter=None):
+    """Encadeia um clique por troca de print: o print `i` sai e o `i+1` aparece.
+
+    Cada clique é um clone do modelo interpretado uma única vez; os ids dos seis `cTn` de cada clique
+    são reservados em bloco no `IdCounter`.
+    """
+    from pptx.oxml.ns import qn
+    main_sequence = _get_or_create_main_sequence(slide)
+    id_counter = id_counter or IdCounter(10)
+    modelo = _modelo_xml(_XML_CLIQUE)
+    tag_ctn, tag_alvo = qn('p:cTn'), qn('p:spTgt')
+    por_clique = len(OFFSETS_IDS_CLIQUE)
+    primeiro_id = id_counter.reserve(por_clique * (len(shape_ids) - 1))
+    for i, (saindo, entrando) in enumerate(zip(shape_ids, shape_ids[1:])):
+        clique = copy.deepcopy(modelo)
+        for offset, ctn in zip(OFFSETS_IDS_CLIQUE, clique.iter(tag_ctn)): ctn.set('id', str(primeiro_id + i * por_clique + offset))
+        alvo_saida, alvo_entrada = clique.iter(tag_alvo)
+        alvo_saida.set('spid', str(saindo))
+        alvo_entrada.set('spid', str(entrando))
+        main_sequence.append(clique)
 
 class IdCounter:
     def __init__(self, start_id): self._id = start_id
     def get(self): return self._id
     def increment(self, value=1): self._id += value; return self._id
+    def reserve(self, count):
+        """Reserva `count` ids consecutivos e retorna o primeiro deles."""
+        first = self._id; self._id += count; return first
 
 # --- FUNÇÕES DE LÓGICA DE NEGÓCIO E API ---
-def read_tickets_csv(csv_path):
-    """Lê o arquivo CSV e retorna um dicionário com os dados."""
-    tickets_data = {}
-    if not os.path.exists(csv_path): return tickets_data
-    with open(csv_path, mode='r', encoding='utf-8') as file:
-        reader = csv.DictReader(file, delimiter=';')
-        for row in reader:
-            if suite_id := row.get('suite', '').strip():
-                tickets_data[suite_id] = {k: v.strip() for k, v in row.items()}
+ORDEM_SEM_POSICAO = 999999
+
+class Ticket:
+    """Linha do CSV de tickets, já com `ordem` convertida para inteiro (ORDEM_SEM_POSICAO quando ausente)."""
+    __slots__ = ('suite', 'titulo', 'movidesk', 'ordem', 'observacao')
+
+    def __init__(self, suite, titulo, movidesk, ordem, observacao):
+        self.suite, self.titulo, self.movidesk, self.ordem, self.observacao = suite, titulo, movidesk, ordem, observacao
+
+class TabelaTickets:
+    """Tickets de um ou mais CSVs, carregados uma única vez e indexados pela suite e pelo número do Movidesk.
+
+    É a mesma tabela que ordena as pastas de tarefa, preenche o rodapé dos slides e alimenta a distribuição.
+    Quando a mesma suite aparece em mais de um CSV, vale a última linha lida; no índice do Movidesk vale a
+    primeira, já que a distribuição grava o mesmo valor no ticket independentemente da suite de origem.
+    """
+    def __init__(self):
+        self.por_suite, self.por_movidesk = {}, {}
+
+    def carregar(self, csv_path):
+        """Acrescenta as linhas de um CSV (separado por ';', com cabeçalho) à tabela."""
+        with open(csv_path, mode='r', encoding='utf-8', newline='') as file:
+            reader = csv.reader(file, delimiter=';')
+            colunas = {nome.strip(): i for i, nome in enumerate(next(reader, []))}
+            campos = [colunas.get(nome) for nome in Ticket.__slots__]
+            for row in reader:
+                suite, titulo, movidesk, ordem, observacao = (row[i].strip() if i is not None and i < len(row) else '' for i in campos)
+                ticket = Ticket(sys.intern(suite), titulo, sys.intern(movidesk), int(ordem) if ordem.isdigit() and int(ordem) else ORDEM_SEM_POSICAO, observacao)
+                if suite: self.por_suite[suite] = ticket
+                if movidesk: self.por_movidesk.setdefault(movidesk, ticket)
+        return self
+
+    def __len__(self): return len(self.por_suite)
+    def __contains__(self, suite_id): return suite_id in self.por_suite
+    def get(self, suite_id): return self.por_suite.get(suite_id)
+
+    def ordem(self, suite_id):
+        """Posição da tarefa na apresentação; tarefas fora da tabela vão para o fim."""
+        return ticket.ordem if (ticket := self.por_suite.get(suite_id)) else ORDEM_SEM_POSICAO
+
+    def movidesk(self, suite_id):
+        return ticket.movidesk if (ticket := self.por_suite.get(suite_id)) else "N/A"
+
+def read_tickets_csv(*csv_paths):
+    """Lê um ou mais CSVs de tickets e retorna uma única `TabelaTickets` (arquivos inexistentes são ignorados)."""
+    tickets_data = TabelaTickets()
+    for csv_path in csv_paths:
+        if os.path.exists(csv_path): tickets_data.carregar(csv_path)
     return tickets_data
 
-def process_directory(base_dir, version, prs, layout_new, layout_old, version_novo, mode, tickets_data, numero_final):
-    """Processa diretórios para montar os slides."""
+def process_directory(base_dir, version, prs, layout_new, layout_old, version_novo, mode, tickets_data, numero_final, manifesto_anterior=None, pastas=None, workers=None, gravador=None):
+    """Processa diretórios para montar os slides.
+
+    Com `manifesto_anterior` (e `prs` aberto a partir da saída anterior), apenas os slides cujas pastas
+    mudaram, surgiram ou sumiram são regenerados; os demais são mantidos como estão.
+    `tickets_data` é a `TabelaTickets` que define a ordem das tarefas e o Movidesk do rodapé.
+    `pastas` ({(seção, pasta de versão): [TarefaIndexada]}) restringe a geração a essas pastas, com as tarefas
+    já listadas, sem consultar o índice da árvore; `workers` fixa quantos processos carimbam os prints
+    (padrão: STAMP_WORKERS). Com um `GravadorStreaming`, cada slide é gravado
+    na saída assim que fica pronto (só para geração do zero, em que os slides já nascem na ordem final).
+    Retorna o manifesto da apresentação resultante.
+    """
     counts = {"new": 0, "old": 0}
-    for section in ["new", "old"]:
-        section_dir = os.path.join(base_dir, section)
-        if not os.path.exists(section_dir): continue
+    bytes_por_secao = {"new": [0, 0], "old": [0, 0]}
+    contagem_cache = Counter()
+    slides = []
+    if pastas is None: secoes = obter_indice(base_dir, sincronizar=True).secoes
+    else:
+        secoes = {}
+        for (section, folder), tarefas in pastas.items(): secoes.setdefault(section, {})[folder] = tarefas
+    for section, folder in _pastas_do_modo(secoes, mode, numero_final):
         layout = layout_new if section == "new" else layout_old
-        sorted_folders = ordenar_pastas([p for p in os.listdir(section_dir) if os.path.isdir(os.path.join(section_dir, p))], numero_final)
-        for folder in sorted_folders:
-            folder_path = os.path.join(section_dir, folder)
+        current_version = version_novo if folder.lower() == "novo" else (version if folder.lower() == "final" else f"{'.'.join(version.split('.')[:2])}.{int(folder.split(' ')[-1]):03d}")
+        for t in sorted(secoes[section][folder], key=lambda t: (tickets_data.ordem(t.suite_id), t.nome)):
+            if t.prints: slides.append((section, layout, t.nome, current_version, tickets_data.movidesk(t.suite_id), list(t.prints)))
+    caixa = caixa_do_print(prs, POLITICA_IMAGEM)
+    # Separa os slides que podem ser mantidos da saída anterior dos que precisam ser (re)gerados.
+    anteriores = (manifesto_anterior or {}).get("pastas", {})
+    ids_existentes = {sldId.id for sldId in prs.slides._sldIdLst}
+    manifesto, a_gerar = {}, []
+    for section, layout, task_folder, current_version, movidesk, prints in slides:
+        chave = os.path.relpath(os.path.dirname(prints[0]), base_dir).replace(os.sep, '/')
+        anterior = anteriores.get(chave, {})
+        entrada = _entrada_manifesto(section, task_folder, current_version, movidesk, prints, caixa, anterior)
+        if entrada["assinatura"] and anterior.get("assinatura") == entrada["assinatura"] and anterior.get("slide_id") in ids_existentes:
+            entrada["slide_id"] = anterior["slide_id"]
+        else:
+            a_gerar.append((chave, section, layout, task_folder, current_version, movidesk, prints))
+        manifesto[chave] = entrada
+        counts[section] += 1
+    mantidos = {e["slide_id"] for e in manifesto.values() if "slide_id" in e}
+    removidos = [e["slide_id"] for e in anteriores.values() if e.get("slide_id") not in mantidos]
+    for slide_id in removidos: _remover_slide(prs, slide_id)
+    # Os prints dos slides a gerar são lidos antecipadamente, carimbados em paralelo e consumidos na ordem dos slides.
+    posicoes = [(p, idx + 1, len(prints)) for *_, prints in a_gerar for idx, p in enumerate(prints)]
+    leitura = LeituraAntecipada([p for p, *_ in posicoes], PREFETCH_MB * 1024 * 1024, PREFETCH_THREADS) if PREFETCH_MB > 0 and posicoes else None
+    origens = iter(leitura) if leitura else (p for p, *_ in posicoes)
+    jobs = ((origem, order, total, caixa, POLITICA_IMAGEM) for origem, (_, order, total) in zip(origens, posicoes))
+    workers = workers or STAMP_WORKERS or os.cpu_count() or 1
+    if workers > 1 and a_gerar: from concurrent.futures import ProcessPoolExecutor
+    with (ProcessPoolExecutor(workers) if workers > 1 and a_gerar else contextlib.nullcontext()) as executor, leitura or contextlib.nullcontext():
+        hashes = []
+        carimbados = (hashes.append(c.sha256) or c for c in carimbar_prints(jobs, executor, janela=workers * 2, contagem=contagem_cache))
+        for chave, section, layout, task_folder, current_version, movidesk, prints in a_gerar:
+            originais, incorporados = add_images_with_animation(prs, layout, task_folder, current_version, prints, movidesk, carimbados)
+            manifesto[chave]["slide_id"] = prs.slides._sldIdLst[-1].id
+            if manifesto[chave]["assinatura"] is None:
+                for entrada, sha in zip(manifesto[chave]["prints"], hashes[-len(prints):]): entrada["sha256"] = sha
+                _assinar_entrada(manifesto[chave], section, task_folder, current_version, movidesk, caixa)
+            if gravador: gravador.gravar_slide(prs.slides[-1])
+            bytes_por_secao[section][0] += originais
+            bytes_por_secao[section][1] += incorporados
+    CACHE_PRINTS.podar()
+    if not gravador: _ordenar_slides(prs, [e["slide_id"] for e in manifesto.values()])
+    print(f"\n{Cores.AZUL}{'='*60}\n      RESUMO DO PROCESSAMENTO DA APRESENTAÇÃO\n{'='*60}{Cores.RESET}")
+    print(f"Total de novas implementações (new) processadas: {counts['new']}")
+    print(f"Total de old (old) processados: {counts['old']}")
+    if manifesto_anterior is not None:
+        print(f"Slides mantidos da versão anterior: {len(manifesto) - len(a_gerar)} | regenerados: {len(a_gerar)} | removidos: {len(removidos)}")
+    for section, (originais, incorporados) in bytes_por_secao.items():
+        if originais: print(f"Imagens ({section}): {_formatar_bytes(originais)} -> {_formatar_bytes(incorporados)} (economia de {_formatar_bytes(originais - incorporados)})")
+    if CACHE_PRINTS.ativo: print(f"Cache de prints: {contagem_cache['cache_acertos']} acertos, {contagem_cache['cache_falhas']} falhas")
+    if leitura and (resumo := leitura.resumo()): print(resumo)
+    print(f"{Cores.AZUL}{'='*60}{Cores.RESET}")
+    return {"pastas": manifesto}
+
+def _pastas_do_modo(secoes, mode, numero_final):
+    """Gera, na ordem da apresentação, os pares (seção, pasta de versão) de `secoes` que entram no modo escolhido."""
+    for section in ["new", "old"]:
+        if section not in secoes: continue
+        for folder in ordenar_pastas(list(secoes[section]), numero_final):
             folder_num = extrair_numero(folder, numero_final)
             if (mode == "F" and folder.lower() != "novo") or \
                 (mode == "L" and (folder.lower() == "novo" or folder_num > numero_final)) or \
                 (mode == "P" and folder.lower() != "novo" and folder_num <= numero_final):
                 continue
-            current_version = version_novo if folder.lower() == "novo" else (version if folder.lower() == "final" else f"{'.'.join(version.split('.')[:2])}.{int(folder.split(' ')[-1]):03d}")
-            task_folders = sorted([(tickets_data.get(f.split(' - ')[0].strip(), {}).get("ordem", 999999), f) for f in os.listdir(folder_path) if os.path.isdir(os.path.join(folder_path, f))])
-            for _, task_folder in task_folders:
-                task_path = os.path.join(folder_path, task_folder)
-                prints = sorted([os.path.join(task_path, f) for f in os.listdir(task_path) if f.lower().endswith(('.png', '.jpg', '.jpeg'))])
-                if prints:
-                    add_images_with_animation(prs, layout, task_folder, current_version, prints, tickets_data)
-                    counts[section] += 1
-    print(f"\n{Cores.AZUL}{'='*60}\n      RESUMO DO PROCESSAMENTO DA APRESENTAÇÃO\n{'='*60}{Cores.RESET}")
-    print(f"Total de novas implementações (new) processadas: {counts['new']}")
-    print(f"Total de old (old) processados: {counts['old']}")
-    print(f"{Cores.AZUL}{'='*60}{Cores.RESET}")
+            yield section, folder
+
+def _hash_arquivo(caminho):
+    with open(caminho, 'rb') as f: return hashlib.sha256(f.read()).hexdigest()
+
+def _entrada_manifesto(section, task_folder, current_version, movidesk, prints, caixa, anterior):
+    """Monta a entrada do manifesto de uma pasta de tarefa.
+
+    O hash de cada print só é recalculado quando tamanho ou mtime mudaram em relação a `anterior`.
+    Sem `anterior` o slide será gerado de qualquer forma, então nenhum print é lido aqui: os hashes e a
+    assinatura ficam vazios e são preenchidos com os hashes calculados no carimbo (`_assinar_entrada`).
+    """
+    conhecidos = {p["nome"]: p for p in anterior.get("prints", [])}
+    entradas = []
+    for caminho in prints:
+        st, nome = os.stat(caminho), os.path.basename(caminho)
+        conhecido = conhecidos.get(nome, {})
+        if (conhecido.get("tamanho"), conhecido.get("mtime_ns")) == (st.st_size, st.st_mtime_ns): sha = conhecido["sha256"]
+        else: sha = _hash_arquivo(caminho) if anterior else None
+        entradas.append({"nome": nome, "tamanho": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha})
+    entrada = {"prints": entradas, "assinatura": None}
+    return _assinar_entrada(entrada, section, task_folder, current_version, movidesk, caixa) if anterior else entrada
+
+def _assinar_entrada(entrada, section, task_folder, current_version, movidesk, caixa):
+    """Calcula a assinatura da entrada: tudo o que influencia o slide (prints, título, versão, rodapé e política de imagem)."""
+    conteudo = [section, task_folder, current_version, movidesk, caixa, tuple(POLITICA_IMAGEM), CachePrints.VERSAO, [p["sha256"] for p in entrada["prints"]]]
+    entrada["assinatura"] = hashlib.sha256(json.dumps(conteudo).encode()).hexdigest()
+    return entrada
+
+def _remover_slide(prs, slide_id):
+    """Remove um slide (e sua relação com a apresentação) pelo id."""
+    sld_id_lst = prs.slides._sldIdLst
+    for sld_id in sld_id_lst:
+        if sld_id.id == slide_id:
+            sld_id_lst.remove(sld_id)
+            prs.part.drop_rel(sld_id.rId)
+            return
+
+def _ordenar_slides(prs, slide_ids):
+    """Coloca os slides gerados na ordem de `slide_ids`, após os slides próprios do template.
+
+    Também renumera os nomes das partes dos slides, que podem colidir após remoções e inclusões.
+    """
+    from pptx.opc.packuri import PackURI
+    sld_id_lst = prs.slides._sldIdLst
+    por_id = {sld_id.id: sld_id for sld_id in sld_id_lst}
+    for slide_id in slide_ids:
+        sld_id_lst.remove(por_id[slide_id])
+        sld_id_lst.append(por_id[slide_id])
+    for idx, slide in enumerate(prs.slides, 1): slide.part.partname = PackURI(f"/ppt/slides/slide{idx}.xml")
+
+@lru_cache(maxsize=None)
+def _classe_imagem_gravada():
+    from pptx.parts.image import ImagePart
+
+    class ImagemGravada(ImagePart):
+        """Imagem já gravada pelo `GravadorStreaming`: sem os bytes, mas com o hash e o tamanho nativo guardados."""
+        _native_size = None
+
+    return ImagemGravada
+
+class GravadorStreaming:
+    """Grava a apresentação aos poucos: cada slide pronto vai para o arquivo com suas imagens e é liberado.
+
+    O python-pptx mantém o XML de todos os slides e os bytes de todas as imagens até o `save`; aqui eles
+    são gravados no zip assim que o slide fica pronto e trocados por um slide vazio e um blob vazio, de
+    modo que só as partes da apresentação, dos layouts e do template ficam em memória até `finalizar`,
+    que grava essas partes, as relações do pacote e o `[Content_Types].xml` por último.
+    """
+    def __init__(self, prs, output_path):
+        import zipfile
+        self.prs, self.output_path = prs, output_path
+        self._temporario = f"{output_path}.tmp"
+        self._zip = zipfile.ZipFile(self._temporario, 'w', zipfile.ZIP_DEFLATED)
+        self._gravadas = set()  # Partes (partnames) já gravadas no zip.
+
+    def _gravar(self, partname, blob): self._zip.writestr(partname.membername, blob)
+
+    def gravar_slide(self, slide):
+        """Grava o slide, suas relações e suas imagens ainda não gravadas; depois libera o XML e as imagens."""
+        from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+        from pptx.oxml.slide import CT_Slide
+        part = slide.part
+        self._gravar(part.partname, part.blob)
+        self._gravar(part.partname.rels_uri, part.rels.xml)
+        for rel in part.rels.values():
+            if rel.reltype == RT.IMAGE and (imagem := rel.target_part).partname not in self._gravadas:
+                self._gravar(imagem.partname, imagem.blob)
+                self._gravadas.add(imagem.partname)
+                # O hash fica em cache (a deduplicação continua valendo) e o tamanho nativo, usado quando um
+                # print idêntico reaproveita esta imagem, é guardado antes de os bytes serem descartados.
+                imagem.sha1
+                tamanho, imagem.__class__ = imagem._native_size, _classe_imagem_gravada()
+                imagem._native_size, imagem._blob = tamanho, b''
+        self._gravadas.add(part.partname)
+        part._element = CT_Slide.new()
+        part.__dict__.pop('slide', None)  # Descarta o `Slide` em cache, que ainda aponta para o XML completo.
+
+    def finalizar(self):
+        """Grava as partes restantes, as relações do pacote e o `[Content_Types].xml`, e publica o arquivo."""
+        from pptx.opc.oxml import serialize_part_xml
+        from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+        from pptx.opc.serialized import _ContentTypesItem
+        package = self.prs.part.package
+        partes = tuple(package.iter_parts())
+        for part in partes:
+            if part.partname in self._gravadas: continue
+            self._gravar(part.partname, part.blob)
+            if part._rels: self._gravar(part.partname.rels_uri, part.rels.xml)
+        self._gravar(PACKAGE_URI.rels_uri, package._rels.xml)
+        self._gravar(CONTENT_TYPES_URI, serialize_part_xml(_ContentTypesItem.xml_for(partes)))
+        self._zip.close()
+        os.replace(self._temporario, self.output_path)
+
+    def descartar(self):
+        self._zip.close()
+        if os.path.exists(self._temporario): os.remove(self._temporario)
+
+def gerar_apresentacao(base_dir, version_final_str, version_novo, mode, tickets_data, numero_final, output_path, incremental=PPTX_INCREMENTAL, pastas=None, workers=None,
+                       streaming=PPTX_STREAMING):
+    """Gera (ou atualiza incrementalmente) a apresentação e grava o manifesto ao lado dela.
+
+    A atualização incremental só é usada se a saída anterior ainda for exatamente a registrada no
+    manifesto e o template não tiver mudado; caso contrário a apresentação é refeita do zero.
+    Com `streaming`, a apresentação é sempre refeita do zero, gravando cada slide assim que fica pronto
+    (ver `GravadorStreaming`), e o pico de memória deixa de crescer com o número de slides.
+    """
+    from pptx import Presentation
+    manifesto_path = f"{output_path}.manifesto.json"
+    st_template = os.stat(PPTX_TEMPLATE_PATH)
+    origem = {"versao": 1, "template": [st_template.st_size, st_template.st_mtime_ns]}
+    manifesto_anterior = None
+    if incremental and not streaming and os.path.exists(output_path) and os.path.exists(manifesto_path):
+        with open(manifesto_path, encoding='utf-8') as f: manifesto_anterior = json.load(f)
+        st_saida = os.stat(output_path)
+        if manifesto_anterior.get("origem") != origem or manifesto_anterior.get("saida") != [st_saida.st_size, st_saida.st_mtime_ns]:
+            manifesto_anterior = None
+    prs = Presentation(output_path if manifesto_anterior else PPTX_TEMPLATE_PATH)
+    gravador = GravadorStreaming(prs, output_path) if streaming else None
+    try:
+        with METRICAS.etapa("slides"):
+            manifesto = process_directory(base_dir, version_final_str, prs, prs.slide_layouts[3], prs.slide_layouts[2], version_novo, mode, tickets_data, numero_final,
+                                          manifesto_anterior, pastas, workers, gravador)
+        with METRICAS.etapa("pptx_save") as medida:
+            if gravador: gravador.finalizar()
+            else: prs.save(output_path)
+            medida["bytes"] = os.path.getsize(output_path)
+    except BaseException:
+        if gravador: gravador.descartar()
+        raise
+    st_saida = os.stat(output_path)
+    manifesto.update(origem=origem, saida=[st_saida.st_size, st_saida.st_mtime_ns])
+    with open(manifesto_path, 'w', encoding='utf-8') as f: json.dump(manifesto, f, ensure_ascii=False)
+
+def _gerar_fragmento(job):
+    """Ponto de entrada dos processos de fragmentação: gera a apresentação de uma única pasta de versão.
+
+    Retorna o caminho do fragmento e as métricas do processo, que são somadas às da ação principal.
+    """
+    *args, output_path, pasta, tarefas = job
+    METRICAS.iniciar("fragmento")
+    gerar_apresentacao(*args, output_path, pastas={pasta: tarefas}, workers=1)
+    return output_path, METRICAS.etapas
+
+def gerar_apresentacao_fragmentada(base_dir, version_final_str, version_novo, mode, tickets_data, numero_final, output_path, mesclar=True, workers=SHARD_WORKERS):
+    """Gera uma apresentação por pasta de versão (seção new/old × pasta), cada uma em seu próprio processo.
+
+    Os fragmentos partem do template e ficam em "powerpoint/fragmentos/<nome da saída>/"; cada processo
+    carimba seus prints em série e só mantém em memória os de uma pasta. Cada fragmento tem seu próprio
+    manifesto, então a geração incremental vale por pasta. Com `mesclar`, os fragmentos são unidos, na
+    ordem, em `output_path`. Retorna a lista de fragmentos gerados.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    diretorio = os.path.join(PPTX_DIR, "fragmentos", os.path.splitext(os.path.basename(output_path))[0])
+    os.makedirs(diretorio, exist_ok=True)
+    # Cada fragmento recebe as tarefas da sua pasta: os processos (iniciados com spawn no Windows) não
+    # têm o índice da sessão e, sem isso, cada um varreria a árvore inteira no compartilhamento.
+    secoes = obter_indice(base_dir, sincronizar=True).secoes
+    jobs = [(base_dir, version_final_str, version_novo, mode, tickets_data, numero_final,
+             os.path.join(diretorio, re.sub(r'[^\w.-]+', '_', f"{i:02d}_{section}_{folder}") + ".pptx"), (section, folder), secoes[section][folder])
+            for i, (section, folder) in enumerate(_pastas_do_modo(secoes, mode, numero_final), 1)]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    inicio = time.perf_counter()
+    fragmentos = []
+    with ProcessPoolExecutor(workers) as executor:
+        for fragmento, etapas in executor.map(_gerar_fragmento, jobs):
+            fragmentos.append(fragmento)
+            for nome, etapa in etapas.items(): METRICAS.registrar(nome, etapa["segundos"], etapa["chamadas"], etapa["bytes"])
+    print(f"\n{len(fragmentos)} fragmento(s) gerado(s) em {time.perf_counter() - inicio:.2f}s com {workers} processo(s), em '{diretorio}'.")
+    if mesclar: mesclar_apresentacoes(fragmentos, output_path)
+    return fragmentos
+
+def mesclar_apresentacoes(fragmentos, output_path):
+    """Une, na ordem, os slides gerados de cada fragmento em uma apresentação nova criada a partir do template.
+
+    Os slides do próprio template, repetidos em cada fragmento, são ignorados. Cada slide é copiado inteiro
+    (formas e linha do tempo); como os ids de formas e de animação valem por slide, continuam válidos.
+    As imagens são reincorporadas no pacote de destino, sem duplicatas, e as referências `r:embed` remapeadas.
+    """
+    from pptx import Presentation
+    from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+    from pptx.oxml.ns import qn
+    prs = Presentation(PPTX_TEMPLATE_PATH)
+    slides_template = len(prs.slides)
+    tag_blip, attr_embed = qn('a:blip'), qn('r:embed')
+    for caminho in fragmentos:
+        origem = Presentation(caminho)
+        for slide in list(origem.slides)[slides_template:]:
+            novo = prs.slides.add_slide(prs.slide_layouts[origem.slide_layouts.index(slide.slide_layout)])
+            sp_tree = novo.shapes._spTree
+            for elemento in list(sp_tree)[2:]: sp_tree.remove(elemento)  # Mantém apenas nvGrpSpPr e grpSpPr.
+            rids = {rId: novo.part.get_or_add_image_part(io.BytesIO(rel.target_part.blob))[1]
+                    for rId, rel in slide.part.rels.items() if rel.reltype == RT.IMAGE}
+            for elemento in list(slide.shapes._spTree)[2:]:
+                elemento = copy.deepcopy(elemento)
+                for blip in elemento.iter(tag_blip): blip.set(attr_embed, rids[blip.get(attr_embed)])
+                sp_tree.append(elemento)
+            if (timing := slide.element.find(qn('p:timing'))) is not None: novo.element.append(copy.deepcopy(timing))
+    with METRICAS.etapa("pptx_save") as medida:
+        prs.save(output_path)
+        medida["bytes"] = os.path.getsize(output_path)
+    print(f"{Cores.VERDE}{len(prs.slides) - slides_template} slides de {len(fragmentos)} fragmento(s) unidos em '{output_path}'.{Cores.RESET}")
+
+def _gerar_pptx(base_dir, version_final_str, version_novo, mode, tickets_data, output_path, fragmentar=PPTX_SHARDS, mesclar=True):
+    """Gera a apresentação inteira em um processo ou, com `fragmentar`, um fragmento por pasta de versão."""
+    numero_final = extrair_numero_final(version_final_str)
+    if not fragmentar:
+        gerar_apresentacao(base_dir, version_final_str, version_novo, mode, tickets_data, numero_final, output_path)
+    else:
+        gerar_apresentacao_fragmentada(base_dir, version_final_str, version_novo, mode, tickets_data, numero_final, output_path, mesclar)
+        if not mesclar: return
+    print(f"\n{Cores.VERDE}Apresentação salva como '{output_path}' com sucesso!{Cores.RESET}")
+
+def _formatar_bytes(n):
+    """Formata uma quantidade de bytes em unidade legível."""
+    for unidade in ("B", "KB", "MB"):
+        if abs(n) < 1024: return f"{n:.1f} {unidade}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+def extrair_numero_final(version_final_str):
+    """Extrai o número da versão final (ex.: 'X.Y.015' -> 15); usa 10 se não houver um."""
+    try: return int(version_final_str.split('.')[-1])
+    except (IndexError, ValueError): return 10
 
 def extrair_numero(pasta, numero_final):
     """Extrai o número de uma pasta para ordenação."""
@@ -268,34 +997,229 @@ def ordenar_pastas(pastas, numero_final):
     """Ordena as pastas com base no número extraído."""
     return sorted(pastas, key=lambda p: extrair_numero(p, numero_final))
 
-def distribute_tickets(tickets_path, version):
-    """Lê o CSV e distribui os tickets no Movidesk."""
-    if not os.path.exists(tickets_path):
-        print(f"{Cores.VERMELHO}ERRO: Arquivo {tickets_path} não encontrado.{Cores.RESET}")
-        return
-    with open(tickets_path, mode='r', encoding='utf-8') as file:
-        reader = csv.DictReader(file, delimiter=';')
-        for row in reader:
-            if movidesk_num := row.get('movidesk'):
-                post_movidesk(movidesk_num, version, row.get('observacao', ''))
-
-def get_ticket_details(ticket_id, token):
-    """Busca detalhes de um ticket na API do Movidesk."""
-    url = f"https://api.movidesk.com/public/v1/tickets"
-    params = {'token': token, '$filter': f"id eq {ticket_id}", '$select': 'id,customFieldValues', '$expand': 'customFieldValues($expand=items)'}
+def distribute_tickets(tickets, version, cliente=None, journal=None):
+    """Distribui no Movidesk os tickets de um CSV (ou de uma `TabelaTickets` já carregada), em paralelo e
+    respeitando o limite de requisições da API.
+
+    Cada número do Movidesk é atualizado uma única vez. Tickets já registrados no journal para esta versão
+    são pulados, então uma execução interrompida pode ser simplesmente repetida para continuar de onde parou.
+    """
+    if not isinstance(tickets, TabelaTickets):
+        if not os.path.exists(tickets):
+            print(f"{Cores.VERMELHO}ERRO: Arquivo {tickets} não encontrado.{Cores.RESET}")
+            return
+        tickets = read_tickets_csv(tickets)
+    journal = journal or JournalDistribuicao(os.path.join(LOGS_DIR, 'distribuicao_journal.jsonl'))
+    tickets = [(ticket_id, ticket.observacao) for ticket_id, ticket in tickets.por_movidesk.items()]
+    pendentes = [t for t in tickets if not journal.concluido(t[0], version)]
+    if len(pendentes) < len(tickets):
+        print(f"{len(tickets) - len(pendentes)} ticket(s) já distribuído(s) na versão {version} foram pulados (journal).")
+        logger.info(f"Retomando distribuição da versão {version}: {len(tickets) - len(pendentes)} ticket(s) já concluído(s).")
+    cliente = cliente or obter_cliente_movidesk()
+    prefetch_tickets([ticket_id for ticket_id, _ in pendentes], cliente)
+
+    def _distribuir(ticket):
+        ticket_id, observacao = ticket
+        if sucesso := post_movidesk(ticket_id, version, observacao, cliente): journal.registrar(ticket_id, version)
+        return sucesso
+
+    from concurrent.futures import ThreadPoolExecutor
+    with METRICAS.etapa("distribuicao"), ThreadPoolExecutor(max_workers=MOVIDESK_WORKERS) as executor:
+        resultados = list(executor.map(_distribuir, pendentes))
+    print(f"Tickets distribuídos: {sum(resultados)} de {len(resultados)} ({len(resultados) - sum(resultados)} com erro).")
+
+class JournalDistribuicao:
+    """Registro durável, somente de acréscimo, dos pares (ticket, versão) já distribuídos.
+
+    Cada sucesso é gravado em uma linha JSON e sincronizado em disco antes de seguir; na abertura,
+    o arquivo inteiro é carregado em um conjunto para consultas O(1). Uma última linha incompleta
+    (queda no meio da escrita) é ignorada.
+    """
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._concluidos = set()
+        self._lock = threading.Lock()
+        if os.path.exists(caminho):
+            with open(caminho, encoding='utf-8') as f:
+                for linha in f:
+                    with contextlib.suppress(ValueError, KeyError, TypeError):
+                        registro = json.loads(linha)
+                        self._concluidos.add((str(registro["ticket"]), registro["versao"]))
+
+    def concluido(self, ticket_id, versao): return (str(ticket_id), versao) in self._concluidos
+
+    def registrar(self, ticket_id, versao):
+        linha = json.dumps({"ticket": str(ticket_id), "versao": versao, "em": time.strftime('%Y-%m-%dT%H:%M:%S')}, ensure_ascii=False)
+        with self._lock:
+            with open(self.caminho, 'a', encoding='utf-8') as f:
+                f.write(linha + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._concluidos.add((str(ticket_id), versao))
+
+class TokenBucket:
+    """Limitador de taxa thread-safe: libera até `capacidade` requisições de uma vez e repõe `taxa` por segundo."""
+    def __init__(self, taxa, capacidade):
+        self.taxa, self.capacidade = taxa, capacidade
+        self._tokens, self._ultimo = float(capacidade), time.monotonic()
+        self._lock = threading.Lock()
+
+    def adquirir(self):
+        """Bloqueia até haver um token disponível e o consome."""
+        while True:
+            with self._lock:
+                agora = time.monotonic()
+                self._tokens = min(self.capacidade, self._tokens + (agora - self._ultimo) * self.taxa)
+                self._ultimo = agora
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                espera = (1 - self._tokens) / self.taxa
+            time.sleep(espera)
+
+class ClienteMovidesk:
+    """Cliente HTTP da API do Movidesk com conexões reaproveitadas, limite de taxa e novas tentativas.
+
+    Respostas 429 e 5xx são repetidas com backoff exponencial, respeitando o cabeçalho `Retry-After`
+    quando a API o envia. Timeouts e quedas de conexão só são repetidos em métodos idempotentes: um PATCH
+    pode ter sido aplicado antes da falha, e repeti-lo publicaria a ação no ticket de novo. Nos demais
+    métodos só se repete a falha ao abrir a conexão, quando a requisição nem chegou a ser enviada.
+    Com `requisicoes_por_minuto` igual a 0 não há limite de taxa.
+    """
+    STATUS_REPETIVEIS = {429, 500, 502, 503, 504}
+    METODOS_IDEMPOTENTES = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+    def __init__(self, base_url=MOVIDESK_API_URL, token=MOVIDESK_API_TOKEN, conexoes=MOVIDESK_WORKERS,
+                 requisicoes_por_minuto=MOVIDESK_RATE_LIMIT_PER_MINUTE, tentativas=MOVIDESK_MAX_RETRIES, backoff=1.0):
+        import requests
+        self.base_url, self.token = base_url.rstrip('/'), token
+        self.tentativas, self.backoff = tentativas, backoff
+        self.limite = TokenBucket(requisicoes_por_minuto / 60, max(1, conexoes)) if requisicoes_por_minuto > 0 else None
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max(1, conexoes))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def requisitar(self, metodo, caminho, params=None, **kwargs):
+        """Executa a requisição e retorna a resposta bem-sucedida; levanta `requests.RequestException` caso contrário."""
+        import requests
+        params = {'token': self.token, **(params or {})}
+        idempotente = metodo.upper() in self.METODOS_IDEMPOTENTES
+        for tentativa in range(self.tentativas + 1):
+            if self.limite: self.limite.adquirir()
+            try:
+                with METRICAS.etapa("movidesk_http") as medida:
+                    response = self.session.request(metodo, f"{self.base_url}/{caminho}", params=params, timeout=30, **kwargs)
+                    medida["bytes"] = len(response.content)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if tentativa == self.tentativas or not (idempotente or _falha_antes_do_envio(e)): raise
+                response = None
+            if response is not None and (response.status_code not in self.STATUS_REPETIVEIS or tentativa == self.tentativas):
+                response.raise_for_status()
+                return response
+            espera = self.backoff * 2 ** tentativa + random.uniform(0, self.backoff)
+            if response is not None and (retry_after := response.headers.get('Retry-After', '')).isdigit(): espera = max(espera, int(retry_after))
+            logger.debug(f"{metodo} {caminho} – nova tentativa em {espera:.1f}s ({response.status_code if response is not None else 'falha de conexão'})")
+            time.sleep(espera)
+
+def _falha_antes_do_envio(erro):
+    """Indica se a falha aconteceu ao abrir a conexão, ou seja, antes de a requisição ser enviada."""
+    import requests
+    from urllib3.exceptions import MaxRetryError, NewConnectionError
+    if isinstance(erro, requests.ConnectTimeout): return True
+    causa = erro.args[0] if erro.args else None
+    return isinstance(causa, MaxRetryError) and isinstance(causa.reason, NewConnectionError)
+
+_CLIENTE_MOVIDESK = None
+
+def obter_cliente_movidesk():
+    """Retorna o cliente do Movidesk compartilhado pela sessão."""
+    global _CLIENTE_MOVIDESK
+    if _CLIENTE_MOVIDESK is None: _CLIENTE_MOVIDESK = ClienteMovidesk()
+    return _CLIENTE_MOVIDESK
+
+_AUSENTE = object()
+
+class CacheTickets:
+    """Cache em memória, thread-safe e com validade (TTL), dos detalhes de tickets do Movidesk."""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._itens = {}
+        self._lock = threading.Lock()
+
+    def obter(self, ticket_id, padrao=_AUSENTE):
+        """Retorna os detalhes (ou None, se o ticket não existe) ou `padrao` se não estiver em cache ou tiver expirado."""
+        with self._lock: guardado = self._itens.get(str(ticket_id))
+        if guardado is None or time.monotonic() - guardado[0] > self.ttl: return padrao
+        return guardado[1]
+
+    def guardar(self, ticket_id, detalhes):
+        with self._lock: self._itens[str(ticket_id)] = (time.monotonic(), detalhes)
+
+    def contem(self, ticket_id): return self.obter(ticket_id) is not _AUSENTE
+
+CACHE_TICKETS = CacheTickets(MOVIDESK_CACHE_TTL)
+CAMPOS_TICKET = {'$select': 'id,customFieldValues', '$expand': 'customFieldValues($expand=items)'}
+
+def _itens_da_resposta(data):
+    items = data.get('items', data) if isinstance(data, dict) else data
+    return items if isinstance(items, list) else ([data] if isinstance(data, dict) and 'id' in data else [])
+
+def prefetch_tickets(ticket_ids, cliente=None, ids_por_consulta=50, por_pagina=100):
+    """Carrega no cache os campos personalizados de vários tickets com poucas consultas OData.
+
+    Os IDs são agrupados em filtros `id eq A or id eq B ...` e cada consulta é paginada com `$top`/`$skip`.
+    Tickets que a API não devolver ficam em cache como inexistentes, para não gerar outra busca depois.
+    IDs não numéricos (como o "Não encontrado" do CSV) invalidariam o filtro do lote inteiro: eles ficam
+    fora das consultas, são registrados no log uma vez e também vão para o cache como inexistentes.
+    """
+    import requests
+    cliente = cliente or obter_cliente_movidesk()
+    pendentes = list(dict.fromkeys(str(t).strip() for t in ticket_ids if not CACHE_TICKETS.contem(t)))
+    if invalidos := [ticket_id for ticket_id in pendentes if not ticket_id.isdigit()]:
+        logger.warning(f"Pré-carga: {len(invalidos)} ID(s) de ticket inválido(s) ignorado(s): {', '.join(invalidos)}")
+        for ticket_id in invalidos: CACHE_TICKETS.guardar(ticket_id, None)
+        pendentes = [ticket_id for ticket_id in pendentes if ticket_id.isdigit()]
+    consultas = 0
+    for inicio in range(0, len(pendentes), ids_por_consulta):
+        lote = pendentes[inicio:inicio + ids_por_consulta]
+        filtro = " or ".join(f"id eq {ticket_id}" for ticket_id in lote)
+        encontrados, skip = {}, 0
+        try:
+            while True:
+                data = cliente.requisitar('GET', 'tickets', params={'$filter': filtro, '$top': por_pagina, '$skip': skip, **CAMPOS_TICKET}).json()
+                consultas += 1
+                items = _itens_da_resposta(data)
+                encontrados.update((str(item.get('id')), item) for item in items)
+                if len(items) < por_pagina: break
+                skip += por_pagina
+        except requests.RequestException as e:
+            logger.error(f"Erro na API ao pré-carregar tickets {lote[0]}..{lote[-1]}. Erro: {e}")
+            continue
+        for ticket_id in lote: CACHE_TICKETS.guardar(ticket_id, encontrados.get(ticket_id))
+    logger.debug(f"Pré-carga: {len(pendentes)} tickets em {consultas} consulta(s).")
+
+def get_ticket_details(ticket_id, token, cliente=None):
+    """Busca detalhes de um ticket na API do Movidesk (ou no cache preenchido por `prefetch_tickets`)."""
+    import requests
+    if (detalhes := CACHE_TICKETS.obter(ticket_id)) is not _AUSENTE: return detalhes
+    cliente = cliente or obter_cliente_movidesk()
+    params = {'token': token, '$filter': f"id eq {ticket_id}", **CAMPOS_TICKET}
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        items = data.get('items', data)
-        return items[0] if isinstance(items, list) and items else (data if isinstance(data, dict) and 'id' in data else None)
+        items = _itens_da_resposta(cliente.requisitar('GET', 'tickets', params=params).json())
+        detalhes = items[0] if items else None
+        CACHE_TICKETS.guardar(ticket_id, detalhes)
+        return detalhes
     except requests.RequestException as e:
         logger.error(f"Erro na API ao buscar ticket {ticket_id}. Erro: {e}")
         return None
 
-def post_movidesk(ticket_id, version, observacao=''):
-    """Atualiza um ticket no Movidesk."""
-    ticket_details = get_ticket_details(ticket_id, MOVIDESK_API_TOKEN)
+def post_movidesk(ticket_id, version, observacao='', cliente=None):
+    """Atualiza um ticket no Movidesk. Retorna True se a distribuição foi bem-sucedida."""
+    import requests
+    cliente = cliente or obter_cliente_movidesk()
+    ticket_details = get_ticket_details(ticket_id, cliente.token, cliente)
     custom_fields = [{"items": [], "customFieldId": MOVIDESK_VERSION_FIELD_ID, "customFieldRuleId": 620, "line": 1, "value": version}]
     if ticket_details:
         for field in ticket_details.get('customFieldValues', []):
@@ -313,94 +1237,491 @@ def post_movidesk(ticket_id, version, observacao=''):
         "actions": [{"type": 1, "origin": 9, "description": descricao, "status": "Nova Version", "createdBy": {"id": MOVIDESK_ACTION_CREATOR_ID, "personType": 2, "profileType": 2}}]
     }
     try:
-        response = requests.patch(f"https://api.movidesk.com/public/v1/tickets?token={MOVIDESK_API_TOKEN}&id={ticket_id}", json=payload)
-        response.raise_for_status()
+        cliente.requisitar('PATCH', 'tickets', params={'id': ticket_id}, json=payload)
         logger.info(f'{ticket_id} – distribuído com sucesso')
+        return True
     except requests.RequestException:
         logger.error(f'{ticket_id} – erro na distribuição', exc_info=True)
+        return False
+
+# Uma pasta de tarefa do índice: `nome` é "suite - título", `prints` são os caminhos completos, já ordenados.
+TarefaIndexada = namedtuple('TarefaIndexada', 'suite_id nome path secao pasta_versao prints')
+
+class IndiceAtivos:
+    """Índice em memória da árvore de ativos de uma versão, montado com uma única varredura via `os.scandir`.
+
+    `secoes` mapeia seção ("new"/"old") → pasta de versão → lista de `TarefaIndexada`;
+    `por_suite` mapeia o ID da suite para a sua pasta (a primeira encontrada, como antes).
+    Cada diretório lido guarda o seu mtime, e `sincronizar` relê apenas os diretórios cujo mtime mudou.
+    As consultas só leem `secoes`/`por_suite`, trocados de uma vez ao fim de cada sincronização, e as
+    sincronizações são serializadas; assim o índice pode ser compartilhado entre threads.
+    """
+    # Diretórios alterados há menos que isto não têm a listagem reaproveitada: o mtime de alguns
+    # compartilhamentos tem resolução de segundos e uma mudança logo após a leitura passaria despercebida.
+    MARGEM_MTIME_NS = 2_000_000_000
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+        self.secoes = {}
+        self.por_suite = {}
+        self._listagens = {}  # diretório -> (mtime_ns, subpastas ou prints)
+        self._lock = threading.Lock()
+        self.sincronizar()
+
+    def _listar(self, caminho, pastas=True):
+        """Subpastas [(nome, caminho)] ou prints de `caminho`, relidos só se o mtime mudou; None se o diretório sumiu."""
+        self._lidos.add(caminho)
+        try: mtime = os.stat(caminho).st_mtime_ns
+        except FileNotFoundError:
+            self._listagens.pop(caminho, None)
+            return None
+        if (cache := self._listagens.get(caminho)) and cache[0] == mtime: return cache[1]
+        try:
+            with os.scandir(caminho) as it:
+                if pastas: entradas = [(e.name, e.path) for e in it if e.is_dir()]
+                else: entradas = tuple(sorted(e.path for e in it if e.name.lower().endswith(EXTENSOES_PRINT)))
+        except (FileNotFoundError, NotADirectoryError): return None
+        self._listagens[caminho] = (mtime if time.time_ns() - mtime > self.MARGEM_MTIME_NS else None, entradas)
+        return entradas
+
+    def sincronizar(self):
+        """Atualiza o índice com o estado atual do disco e retorna os IDs de suite cujas pastas mudaram."""
+        with self._lock: return self._sincronizar()
+
+    def _sincronizar(self):
+        anteriores = {t.path: t for pastas in self.secoes.values() for tarefas in pastas.values() for t in tarefas}
+        secoes, por_suite, alteradas, self._lidos = {}, {}, set(), set()
+        for section in ("new", "old"):
+            if (lista_pastas := self._listar(os.path.join(self.base_dir, section))) is None: continue
+            pastas = secoes[section] = {}
+            for nome_pasta, caminho_pasta in lista_pastas:
+                tarefas = pastas[nome_pasta] = []
+                for nome_task, caminho_task in self._listar(caminho_pasta) or ():
+                    if (prints := self._listar(caminho_task, pastas=False)) is None: continue
+                    tarefa = TarefaIndexada(nome_task.split(' - ')[0].strip(), nome_task, caminho_task, section, nome_pasta, prints)
+                    if (anterior := anteriores.pop(caminho_task, None)) is None or anterior.prints != prints: alteradas.add(tarefa.suite_id)
+                    tarefas.append(tarefa)
+                    por_suite.setdefault(tarefa.suite_id, tarefa)
+        alteradas.update(t.suite_id for t in anteriores.values())  # Pastas que sumiram.
+        self._listagens = {c: v for c, v in self._listagens.items() if c in self._lidos}  # Esquece diretórios removidos.
+        self.secoes, self.por_suite = secoes, por_suite
+        return alteradas
+
+    def buscar(self, suite_id):
+        """Retorna a pasta da suite; sem correspondência exata, aceita pastas cujo nome comece pelo ID."""
+        suite_id = str(suite_id).strip()
+        if tarefa := self.por_suite.get(suite_id): return tarefa
+        return next((t for t in self.por_suite.values() if t.nome.strip().startswith(suite_id)), None)
+
+_INDICES = {}
+
+def obter_indice(base_dir, atualizar=False, sincronizar=False):
+    """Retorna o índice da árvore de ativos da sessão.
+
+    Cada ação pede `sincronizar` ao começar: o índice da sessão é conferido com o disco (só as pastas
+    alteradas são relidas), então nenhuma ação trabalha com prints apagados ou contagens antigas. Sem
+    ele a consulta não toca o disco. Com `atualizar`, o índice é montado do zero.
+    """
+    indice = _INDICES.get(base_dir)
+    # Só a montagem e a sincronização leem o disco; a consulta ao índice já montado não entra na métrica.
+    if atualizar or indice is None:
+        with METRICAS.etapa("listagem_pastas"): indice = _INDICES[base_dir] = IndiceAtivos(base_dir)
+    elif sincronizar:
+        with METRICAS.etapa("listagem_pastas"): indice.sincronizar()
+    return indice
 
 def find_task_folder_by_id(base_dir, suite_id):
     """Encontra a pasta de uma tarefa pelo ID."""
-    for section in ["new", "old"]:
-        section_dir = os.path.join(base_dir, section)
-        if not os.path.exists(section_dir): continue
-        for folder in os.listdir(section_dir):
-            if os.path.isdir(os.path.join(section_dir, folder)):
-                for task_folder in os.listdir(os.path.join(section_dir, folder)):
-                    if task_folder.strip().startswith(str(suite_id).strip()):
-                        return {"path": os.path.join(section_dir, folder, task_folder)}
-    return None
-
-def has_image_files(directory_path):
-    """Verifica se um diretório contém arquivos de imagem."""
-    if not os.path.isdir(directory_path): return False
-    return any(f.lower().endswith(('.png', '.jpg', '.jpeg')) for f in os.listdir(directory_path))
-
-def verificar_projeto_no_banco(project_id, base_dir):
-    """Verifica pendências de um projeto e gera um relatório."""
-    print(f"\n--- Iniciando verificação do Projeto ID: {project_id} ---")
+    if not (tarefa := obter_indice(base_dir).buscar(suite_id)): return None
+    return {"path": tarefa.path, "imagens": len(tarefa.prints)}
+
+def _conectar_banco():
+    import pymysql
+    return pymysql.connect(host=DB_HOST, user=DB_USER, password=DB_PASSWORD, database=DB_NAME, charset='utf8mb4')
+
+class PoolConexoes:
+    """Pool de conexões MySQL reaproveitadas entre as etapas (e threads) de uma mesma execução.
+
+    As conexões são abertas sob demanda até `tamanho` e verificadas com `ping` antes de cada uso.
+    """
+    def __init__(self, tamanho=1):
+        self.tamanho = tamanho
+        self._livres = queue.LifoQueue()
+        self._abertas = []
+        self._reservadas = 0
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def conexao(self):
+        try: conn = self._livres.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                pode_abrir = self._reservadas < self.tamanho
+                if pode_abrir: self._reservadas += 1
+            if not pode_abrir: conn = self._livres.get()
+            else:
+                try: conn = _conectar_banco()
+                except Exception:
+                    with self._lock: self._reservadas -= 1
+                    raise
+                with self._lock: self._abertas.append(conn)
+        try:
+            conn.ping(reconnect=True)
+            yield conn
+        finally:
+            self._livres.put(conn)
+
+    def fechar(self):
+        with self._lock:
+            for conn in self._abertas:
+                with contextlib.suppress(Exception): conn.close()
+            self._abertas.clear()
+            self._reservadas = 0
+            self._livres = queue.LifoQueue()
+
+@contextlib.contextmanager
+def conexao_banco(pool=None):
+    """Entrega uma conexão do `pool` ou, sem pool, uma conexão própria que é fechada ao final."""
+    if pool is not None:
+        with pool.conexao() as conn: yield conn
+    else:
+        with _conectar_banco() as conn: yield conn
+
+SQL_TAREFAS_COM_PRIMEIRO_QA = """
+    SELECT tf.task, tf.tk, tf.tt, tf.or, qa.uname
+    FROM utft AS tf
+    JOIN u_tk AS tk ON tf.tk = tk.ntk
+    LEFT JOIN (
+        SELECT c.task, u.uname, ROW_NUMBER() OVER (PARTITION BY c.task ORDER BY c.tinc ASC) AS posicao
+        FROM ucom AS c
+        JOIN usua AS u ON c.idusu = u.umUsuario
+        JOIN (SELECT DISTINCT umUsuario FROM papelDoUser WHERE identificador = %s AND identificador2 = %s) AS papel ON papel.umUsuario = c.idusu
+        WHERE c.task IN (SELECT tf2.task FROM utft AS tf2 JOIN u_tk AS tk2 ON tf2.tk = tk2.ntk WHERE tk2.identificador = %s)
+    ) AS qa ON qa.task = tf.task AND qa.posicao = 1
+    WHERE tk.identificador = %s
+"""
+
+def _consultar_tarefas(project_id, pool=None, contagem=None):
+    """Tarefas do projeto e, para cada uma, o primeiro comentário feito por um QA do projeto (levanta MySQLError).
+
+    Se `contagem` (um Counter) for informada, acumula nela as consultas feitas ao banco.
+    """
     ID_DO_SEU_PAPEL_QA = 2 # Exemplo de ID de papel de negócio
-    problemas = []
+    with METRICAS.etapa("mysql"), conexao_banco(pool) as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(SQL_TAREFAS_COM_PRIMEIRO_QA, (project_id, ID_DO_SEU_PAPEL_QA, project_id, project_id))
+            if contagem is not None: contagem['consultas'] += 1
+            return cursor.fetchall()
+
+def _problema_da_tarefa(base_dir, tarefa):
+    """Retorna a pendência de uma linha de `_consultar_tarefas` na pasta de prints, ou None se estiver tudo certo."""
+    task, nid_ticket, titulo, ordem, QA_name = tarefa
+    if not nid_ticket: return None
+    problema = None
+    if not (folder_info := find_task_folder_by_id(base_dir, nid_ticket)): problema = "PASTA NÃO ENCONTRADA"
+    elif not folder_info["imagens"]: problema = "PASTA CRIADA, MAS SEM PRINTS"
+    return {"tk": nid_ticket, "ordem": ordem or ORDEM_SEM_POSICAO, "titulo": titulo, "QA": QA_name, "problema": problema} if problema else None
+
+def coletar_problemas_projeto(project_id, base_dir, pool=None):
+    """Consulta as tarefas do projeto e confere as pastas de prints de cada uma.
+
+    Retorna a lista de problemas encontrados, ou None em caso de erro de banco.
+    """
+    import pymysql
+    print(f"\n--- Iniciando verificação do Projeto ID: {project_id} ---")
+    tempos, contagem = {}, Counter()
+    inicio = time.perf_counter()
     try:
-        with pymysql.connect(host=DB_HOST, user=DB_USER, password=DB_PASSWORD, database=DB_NAME, charset='utf8mb4') as connection:
-            with connection.cursor() as cursor:
-                cursor.execute(f"SELECT umUsuario FROM papelDoUser WHERE identificador = {project_id} AND identificador2 = {ID_DO_SEU_PAPEL_QA}")
-                QAs_do_projeto = {row[0] for row in cursor.fetchall()}
-                cursor.execute(f"SELECT tf.task, tf.tk, tf.tt, tf.or FROM utft AS tf JOIN u_tk AS tk ON tf.tk = tk.ntk WHERE tk.identificador = {project_id}")
-                for task, nid_ticket, titulo, ordem in cursor.fetchall():
-                    if not nid_ticket: continue
-                    QA_name = None
-                    if QAs_do_projeto:
-                        in_clause = f"IN {tuple(QAs_do_projeto)}" if len(QAs_do_projeto) > 1 else f"= {list(QAs_do_projeto)[0]}"
-                        cursor.execute(f"SELECT u.uname FROM ucom AS c JOIN usua AS u ON c.idusu = u.umUsuario WHERE c.task = {task} AND c.idusu {in_clause} ORDER BY c.tinc ASC LIMIT 1")
-                        if result := cursor.fetchone(): QA_name = result[0]
-                    problema = None
-                    if not (folder_info := find_task_folder_by_id(base_dir, nid_ticket)): problema = "PASTA NÃO ENCONTRADA"
-                    elif not has_image_files(folder_info["path"]): problema = "PASTA CRIADA, MAS SEM PRINTS"
-                    if problema: problemas.append({"tk": nid_ticket, "ordem": ordem or 999999, "titulo": titulo, "QA": QA_name, "problema": problema})
+        tarefas = _consultar_tarefas(project_id, pool, contagem)
     except pymysql.MySQLError as e:
-        print(f"{Cores.VERMELHO}ERRO DE BANCO DE DADOS: {e}{Cores.RESET}")
-        return
+        print(f"{Cores.VERMELHO}ERRO DE BANCO DE DADOS (Projeto {project_id}): {e}{Cores.RESET}")
+        return None
+    tempos["banco"] = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    with METRICAS.etapa("verificacao_pastas"):
+        problemas = [p for tarefa in tarefas if (p := _problema_da_tarefa(base_dir, tarefa))]
+    tempos["pastas"] = time.perf_counter() - inicio
+    print(f"Projeto {project_id} – Banco: {contagem['consultas']} consulta(s), {len(tarefas)} tarefas em {tempos['banco']:.2f}s | Pastas: {tempos['pastas']:.2f}s")
+    return problemas
+
+def _escrever_problemas_por_qa(f, problemas):
+    """Escreve os problemas agrupados por QA (tarefas sem QA por último), cada grupo ordenado pela ordem da tarefa."""
+    problemas_agrupados = {}
+    for p in problemas: (problemas_agrupados.setdefault(p["QA"] or "TAREFAS SEM QA", [])).append(p)
+    for QA in sorted(problemas_agrupados.keys(), key=lambda k: (k == "TAREFAS SEM QA", k)):
+        f.write(f"{QA.upper()}\n\n")
+        for p in sorted(problemas_agrupados[QA], key=lambda x: x["ordem"]):
+            f.write(f'{p["tk"]} / {p["ordem"] if p["ordem"] != ORDEM_SEM_POSICAO else "S/O"} - {p["titulo"]} -> {p["problema"]}\n')
+        f.write("\n")
+
+def verificar_projeto_no_banco(project_id, base_dir, pool=None):
+    """Verifica pendências de um projeto e gera um relatório.
+
+    Retorna a lista de problemas encontrados, ou None em caso de erro de banco.
+    """
+    obter_indice(base_dir, sincronizar=True)
+    if (problemas := coletar_problemas_projeto(project_id, base_dir, pool)) is None: return None
+    if not problemas: print(f"\n{Cores.VERDE}VERIFICAÇÃO CONCLUÍDA: Nenhum problema encontrado.{Cores.RESET}")
+    else: print(f"\nVERIFICAÇÃO CONCLUÍDA: {len(problemas)} problemas encontrados. Gerando relatório...")
+    if output_file := _gravar_relatorio_projeto(project_id, problemas):
+        print(f"{Cores.VERDE}Relatório gerado com sucesso em '{output_file}'.{Cores.RESET}")
+    return problemas
+
+def _gravar_relatorio_projeto(project_id, problemas):
+    """Grava (ou, sem problemas, remove) o relatório do projeto; retorna o caminho gravado ou None."""
     output_file = os.path.join(RELATORIOS_DIR, f"relatorio_verificacao_projeto_{project_id}.txt")
     if not problemas:
-        print(f"\n{Cores.VERDE}VERIFICAÇÃO CONCLUÍDA: Nenhum problema encontrado.{Cores.RESET}")
         if os.path.exists(output_file): os.remove(output_file)
-        return
-    print(f"\nVERIFICAÇÃO CONCLUÍDA: {len(problemas)} problemas encontrados. Gerando relatório...")
-    problemas_agrupados = {}
-    for p in problemas: (problemas_agrupados.setdefault(p["QA"] or "TAREFAS SEM QA", [])).append(p)
+        return None
+    with open(output_file, 'w', encoding='utf-8') as f: _escrever_problemas_por_qa(f, problemas)
+    return output_file
+
+def monitorar_pendencias(project_id, base_dir, intervalo=WATCH_POLL_INTERVAL, intervalo_banco=WATCH_DB_INTERVAL, ciclos=None):
+    """Mantém o relatório de pendências do projeto atualizado enquanto os QAs sobem prints (Ctrl+C encerra).
+
+    As tarefas vêm do banco uma vez e são reconsultadas a cada `intervalo_banco` segundos. A pasta de
+    prints é conferida a cada `intervalo` segundos relendo só os diretórios cujo mtime mudou, e só as
+    tarefas dessas pastas são reavaliadas. O relatório só é regravado quando as pendências mudam.
+    `ciclos` limita o número de conferências (None = até Ctrl+C). Retorna as pendências finais.
+    """
+    import pymysql
+    pool, pendencias = PoolConexoes(tamanho=1), {}
+    try:
+        try: tarefas = _consultar_tarefas(project_id, pool)
+        except pymysql.MySQLError as e:
+            print(f"{Cores.VERMELHO}ERRO DE BANCO DE DADOS (Projeto {project_id}): {e}{Cores.RESET}")
+            return None
+        ultima_consulta = time.monotonic()
+        indice = obter_indice(base_dir, atualizar=True)
+        # Chaveadas pela tarefa (e não pelo ticket), como no relatório da verificação: uma linha por tarefa.
+        pendencias = {t[0]: p for t in tarefas if (p := _problema_da_tarefa(base_dir, t))}
+        _gravar_relatorio_projeto(project_id, list(pendencias.values()))
+        print(f"{Cores.CIANO}Monitorando o Projeto {project_id} em '{base_dir}': {len(tarefas)} tarefas, {len(pendencias)} pendência(s). "
+              f"Conferindo a cada {intervalo}s (banco a cada {intervalo_banco}s). Ctrl+C para encerrar.{Cores.RESET}")
+        ciclo = 0
+        while ciclos is None or ciclo < ciclos:
+            ciclo += 1
+            time.sleep(intervalo)
+            with METRICAS.etapa("listagem_pastas"): alteradas = indice.sincronizar()
+            reconsultou = False
+            if time.monotonic() - ultima_consulta >= intervalo_banco:
+                try:
+                    tarefas, reconsultou = _consultar_tarefas(project_id, pool), True
+                except pymysql.MySQLError as e:
+                    print(f"{Cores.AMARELO}[{time.strftime('%H:%M:%S')}] Banco indisponível, mantendo a lista de tarefas anterior: {e}{Cores.RESET}")
+                ultima_consulta = time.monotonic()
+            if not alteradas and not reconsultou: continue
+            # Uma pasta pode corresponder à tarefa pelo ID exato ou por prefixo (ver `IndiceAtivos.buscar`).
+            afetadas = tarefas if reconsultou else [t for t in tarefas if t[1] and any(s.startswith(str(t[1]).strip()) for s in alteradas)]
+            novas = {} if reconsultou else dict(pendencias)
+            for tarefa in afetadas:
+                novas.pop(tarefa[0], None)
+                if problema := _problema_da_tarefa(base_dir, tarefa): novas[tarefa[0]] = problema
+            if novas != pendencias:
+                _gravar_relatorio_projeto(project_id, list(novas.values()))
+                print(f"[{time.strftime('%H:%M:%S')}] {len(alteradas)} pasta(s) alterada(s): {len(novas)} pendência(s) "
+                      f"({len(novas) - len(pendencias):+d}). Relatório atualizado.")
+            pendencias = novas
+    except KeyboardInterrupt:
+        print(f"\n{Cores.CIANO}Monitoramento encerrado.{Cores.RESET}")
+    finally:
+        pool.fechar()
+    return list(pendencias.values())
+
+def verificar_projetos(projetos, base_dir, output_file, workers=VERIFY_WORKERS, pool=None):
+    """Verifica vários projetos em paralelo e gera um único relatório, agrupado por projeto e por QA.
+
+    Os projetos compartilham o índice da pasta de prints e um pool de conexões: o `pool` recebido (que
+    continua aberto ao final) ou um próprio, com até `workers` conexões.
+    Retorna {projeto: problemas} (None para os projetos que falharam no banco).
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    inicio = time.perf_counter()
+    projetos = list(dict.fromkeys(projetos))  # IDs repetidos na linha de comando são verificados uma vez só.
+    obter_indice(base_dir, sincronizar=True)  # Conferido uma vez, antes das threads, que só o consultam.
+    workers = max(1, min(workers, len(projetos)))
+    proprio = pool is None
+    pool = pool or PoolConexoes(tamanho=workers)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            resultados = dict(zip(projetos, executor.map(lambda pid: coletar_problemas_projeto(pid, base_dir, pool), projetos)))
+    finally:
+        if proprio: pool.fechar()
     with open(output_file, 'w', encoding='utf-8') as f:
-        for QA in sorted(problemas_agrupados.keys(), key=lambda k: (k == "TAREFAS SEM QA", k)):
-            f.write(f"{QA.upper()}\n\n")
-            for p in sorted(problemas_agrupados[QA], key=lambda x: x["ordem"]):
-                f.write(f'{p["tk"]} / {p["ordem"] if p["ordem"] != 999999 else "S/O"} - {p["titulo"]} -> {p["problema"]}\n')
-            f.write("\n")
-    print(f"{Cores.VERDE}Relatório gerado com sucesso em '{output_file}'.{Cores.RESET}")
-
-def generate_csv_from_project(project_id, version_string, output_file):
-    """Gera um CSV com todos os tickets de um projeto."""
+        for project_id, problemas in resultados.items():
+            titulo = f"PROJETO {project_id}"
+            if problemas is None: f.write(f"{titulo}: ERRO AO CONSULTAR O BANCO DE DADOS\n\n")
+            elif not problemas: f.write(f"{titulo}: NENHUM PROBLEMA ENCONTRADO\n\n")
+            else:
+                f.write(f"{titulo} ({len(problemas)} problemas)\n{'=' * len(titulo)}\n\n")
+                _escrever_problemas_por_qa(f, problemas)
+    total = sum(len(p) for p in resultados.values() if p)
+    print(f"\nVERIFICAÇÃO CONCLUÍDA: {len(projetos)} projetos em {time.perf_counter() - inicio:.2f}s, {total} problemas encontrados.")
+    print(f"{Cores.VERDE}Relatório consolidado gerado em '{output_file}'.{Cores.RESET}")
+    return resultados
+
+SQL_TICKETS_COM_MOVIDESK = """
+    SELECT tf.tk, tf.tt, tf.or, nc.resumo
+    FROM utft AS tf
+    JOIN u_tk AS tk ON tf.tk = tk.ntk
+    LEFT JOIN (
+        SELECT n.ntk, n.resumo, ROW_NUMBER() OVER (PARTITION BY n.ntk ORDER BY n.dt_altera ASC) AS posicao
+        FROM unc AS n
+        WHERE n.ntk IN (SELECT tf2.tk FROM utft AS tf2 JOIN u_tk AS tk2 ON tf2.tk = tk2.ntk WHERE tk2.identificador = %s)
+    ) AS nc ON nc.ntk = tf.tk AND nc.posicao = 1
+    WHERE tk.identificador = %s
+    ORDER BY COALESCE(NULLIF(tf.or, 0), %s) ASC, tf.or ASC
+"""
+TAMANHO_LOTE_CSV = 500
+
+def _extrair_movidesk(resumo):
+    """Extrai o número do Movidesk do resumo do primeiro registro do ticket."""
+    try: return resumo.split("Movidesk:")[1].split()[0]
+    except (IndexError, AttributeError): return "Não encontrado"
+
+def generate_csv_from_project(project_id, version_string, output_file, pool=None):
+    """Gera um CSV com todos os tickets de um projeto e retorna o caminho do arquivo (None em caso de erro).
+
+    Os tickets chegam já ordenados e com o primeiro registro de `unc` de cada um em uma única consulta,
+    lida em lotes por um cursor do lado do servidor e gravada direto no CSV.
+    """
+    import pymysql
     print(f"\n--- Iniciando geração de CSV para o Projeto ID: {project_id} ---")
-    resultados = []
+    total = 0
+    arquivo_temporario = f"{output_file}.tmp"
     try:
-        with pymysql.connect(host=DB_HOST, user=DB_USER, password=DB_PASSWORD, database=DB_NAME, charset='utf8mb4') as connection:
-            with connection.cursor() as cursor:
-                cursor.execute(f"SELECT tf.tk, tf.tt, tf.or FROM utft AS tf JOIN u_tk AS tk ON tf.tk = tk.ntk WHERE tk.identificador = {project_id} ORDER BY tf.or ASC")
-                for suite_id, titulo, ordem in cursor.fetchall():
-                    if not suite_id: continue
-                    cursor.execute(f"SELECT resumo FROM unc WHERE ntk = '{suite_id}' ORDER BY dt_altera ASC LIMIT 1")
-                    movidesk_num = "Não encontrado"
-                    if result := cursor.fetchone():
-                        try: movidesk_num = result[0].split("Movidesk:")[1].split()[0]
-                        except (IndexError, AttributeError): pass
-                    resultados.append({"suite": suite_id, "titulo": titulo, "movidesk": movidesk_num, "ordem": ordem or 999999, "observacao": ""})
+        with METRICAS.etapa("mysql") as medida, conexao_banco(pool) as connection, \
+                open(arquivo_temporario, mode='w', newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=["suite", "titulo", "movidesk", "ordem", "observacao"], delimiter=';')
+            writer.writeheader()
+            with connection.cursor(pymysql.cursors.SSCursor) as cursor:
+                cursor.execute(SQL_TICKETS_COM_MOVIDESK, (project_id, project_id, ORDEM_SEM_POSICAO))
+                while lote := cursor.fetchmany(TAMANHO_LOTE_CSV):
+                    for suite_id, titulo, ordem, resumo in lote:
+                        if not suite_id: continue
+                        writer.writerow({"suite": suite_id, "titulo": titulo, "movidesk": _extrair_movidesk(resumo), "ordem": ordem or ORDEM_SEM_POSICAO, "observacao": ""})
+                        total += 1
+            medida["bytes"] = file.tell()
     except pymysql.MySQLError as e:
         print(f"{Cores.VERMELHO}ERRO DE BANCO DE DADOS: {e}{Cores.RESET}")
-        return
-    with open(output_file, mode='w', newline='', encoding='utf-8') as file:
-        writer = csv.DictWriter(file, fieldnames=["suite", "titulo", "movidesk", "ordem", "observacao"], delimiter=';')
-        writer.writeheader()
-        writer.writerows(sorted(resultados, key=lambda x: x["ordem"]))
-    print(f"\n{Cores.AZUL}{'='*50}\nRESUMO DA GERAÇÃO - Projeto {project_id}\nTotal de tickets processados: {len(resultados)}\nArquivo gerado: {output_file}\n{'='*50}{Cores.RESET}")
+        if os.path.exists(arquivo_temporario): os.remove(arquivo_temporario)
+        return None
+    os.replace(arquivo_temporario, output_file)
+    print(f"\n{Cores.AZUL}{'='*50}\nRESUMO DA GERAÇÃO - Projeto {project_id}\nTotal de tickets processados: {total}\nArquivo gerado: {output_file}\n{'='*50}{Cores.RESET}")
+    return output_file
+
+# --- MODO NÃO INTERATIVO (LINHA DE COMANDO) ---
+
+def _caminho_csv_projeto(project_id):
+    return os.path.join(RELATORIOS_DIR, f"TicketsTreinamento_Projeto_{project_id}.csv")
+
+def _caminho_apresentacao(mode, version_novo, version_final_str):
+    return os.path.join(PPTX_DIR, f"treinamento_{mode}_{version_novo}_{version_final_str}.pptx")
+
+def _verificar(projetos, version_novo, pool=None):
+    """Verifica um projeto (relatório próprio) ou vários em paralelo (relatório consolidado). Retorna True se não houve erro de banco."""
+    base_dir, projetos = os.path.join(TRAINING_ASSETS_BASE_PATH, version_novo), list(dict.fromkeys(projetos))
+    if len(projetos) == 1: return verificar_projeto_no_banco(projetos[0], base_dir, pool) is not None
+    output_file = os.path.join(RELATORIOS_DIR, f"relatorio_verificacao_consolidado_{version_novo}.txt")
+    return None not in verificar_projetos(projetos, base_dir, output_file, pool=pool).values()
+
+def executar_release(projetos, version_novo, version_final_str, mode, distribuir=False, versao_distribuicao=None, fragmentar=PPTX_SHARDS, mesclar=True):
+    """Executa verificação → CSV → PPTX → (opcionalmente) distribuição para um ou mais projetos.
+
+    Todas as etapas compartilham o mesmo índice da pasta de prints e um único pool de conexões: a
+    verificação dos projetos roda em paralelo (até VERIFY_WORKERS conexões) e a geração dos CSVs
+    reaproveita as conexões já abertas por ela.
+    Retorna 0 em caso de sucesso e 1 se alguma etapa falhar.
+    """
+    base_dir, projetos = os.path.join(TRAINING_ASSETS_BASE_PATH, version_novo), list(dict.fromkeys(projetos))
+    pool = PoolConexoes(tamanho=max(1, min(VERIFY_WORKERS, len(projetos))))
+    try:
+        if not _verificar(projetos, version_novo, pool): return 1
+        csvs = []
+        for project_id in projetos:
+            if (csv_path := generate_csv_from_project(project_id, version_novo, _caminho_csv_projeto(project_id), pool)) is None: return 1
+            csvs.append(csv_path)
+    finally:
+        pool.fechar()
+    tickets_data = read_tickets_csv(*csvs)
+    _gerar_pptx(base_dir, version_final_str, version_novo, mode, tickets_data, _caminho_apresentacao(mode, version_novo, version_final_str), fragmentar, mesclar)
+    if distribuir: distribute_tickets(tickets_data, versao_distribuicao or version_novo)
+    return 0
+
+def _argumentos_fragmentacao(p):
+    p.add_argument("--fragmentar", action=argparse.BooleanOptionalAction, default=PPTX_SHARDS,
+                   help="Gera um fragmento por pasta de versão, em processos paralelos (padrão: PPTX_SHARDS)")
+    p.add_argument("--sem-mesclar", dest="mesclar", action="store_false", help="Com --fragmentar, não une os fragmentos na apresentação final")
+
+def criar_parser():
+    """Monta o parser dos subcomandos do modo não interativo."""
+    parser = argparse.ArgumentParser(description="Automação de treinamentos e tickets. Sem argumentos, abre o menu interativo.")
+    parser.add_argument("--perfil", action=argparse.BooleanOptionalAction, default=PROFILE_SLOWEST_STAGE,
+                        help="Perfila as etapas (cProfile/tracemalloc) e salva em logs/ os perfis da mais lenta (padrão: PROFILE_SLOWEST_STAGE)")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    p = sub.add_parser("verificar", help="Verifica pendências de um ou mais projetos")
+    p.add_argument("projetos", nargs="+", type=int, metavar="PROJETO")
+    p.add_argument("--versao-novo", required=True)
+    p = sub.add_parser("monitorar", help="Mantém o relatório de pendências de um projeto atualizado até Ctrl+C")
+    p.add_argument("projeto", type=int)
+    p.add_argument("--versao-novo", required=True)
+    p.add_argument("--intervalo", type=float, default=WATCH_POLL_INTERVAL, help="Segundos entre conferências da pasta de prints")
+    p.add_argument("--intervalo-banco", type=float, default=WATCH_DB_INTERVAL, help="Segundos entre consultas ao banco")
+    p = sub.add_parser("csv", help="Gera o CSV de tickets de um ou mais projetos")
+    p.add_argument("projetos", nargs="+", type=int, metavar="PROJETO")
+    p.add_argument("--versao-novo", required=True)
+    p = sub.add_parser("pptx", help="Gera a apresentação a partir de um CSV de tickets")
+    p.add_argument("--versao-novo", required=True)
+    p.add_argument("--versao-final", required=True)
+    p.add_argument("--modo", choices="FLAP", type=str.upper, required=True)
+    p.add_argument("--csv", default="TicketsTreinamento.csv")
+    _argumentos_fragmentacao(p)
+    p = sub.add_parser("distribuir", help="Distribui no Movidesk os tickets de um CSV")
+    p.add_argument("--versao", required=True)
+    p.add_argument("--csv", default="TicketsTreinamento_Distribuicao.csv")
+    p = sub.add_parser("release", help="Verificação, CSV, apresentação e (opcional) distribuição em uma única execução")
+    p.add_argument("projetos", nargs="+", type=int, metavar="PROJETO")
+    p.add_argument("--versao-novo", required=True)
+    p.add_argument("--versao-final", required=True)
+    p.add_argument("--modo", choices="FLAP", type=str.upper, required=True)
+    p.add_argument("--distribuir", action="store_true", help="Também distribui os tickets no Movidesk")
+    p.add_argument("--versao-distribuicao", help="Versão informada na distribuição (padrão: --versao-novo)")
+    _argumentos_fragmentacao(p)
+    return parser
+
+def executar_cli(argv):
+    """Executa um subcomando do modo não interativo e retorna o código de saída."""
+    args = criar_parser().parse_args(argv)
+    validar_configuracoes()
+    criar_diretorios()
+    with medir_acao(args.comando, args.perfil): return _executar_comando(args)
+
+def _executar_comando(args):
+    if args.comando == "verificar": return 0 if _verificar(args.projetos, args.versao_novo) else 1
+    if args.comando == "monitorar":
+        return 0 if monitorar_pendencias(args.projeto, os.path.join(TRAINING_ASSETS_BASE_PATH, args.versao_novo), args.intervalo, args.intervalo_banco) is not None else 1
+    if args.comando == "csv":
+        pool = PoolConexoes(tamanho=1)
+        try:
+            for project_id in args.projetos:
+                if generate_csv_from_project(project_id, args.versao_novo, _caminho_csv_projeto(project_id), pool) is None: return 1
+        finally:
+            pool.fechar()
+        return 0
+    if args.comando == "pptx":
+        if not os.path.exists(args.csv):
+            print(f"{Cores.VERMELHO}ERRO: Arquivo '{args.csv}' não encontrado!{Cores.RESET}")
+            return 1
+        _gerar_pptx(os.path.join(TRAINING_ASSETS_BASE_PATH, args.versao_novo), args.versao_final, args.versao_novo, args.modo, read_tickets_csv(args.csv),
+                    _caminho_apresentacao(args.modo, args.versao_novo, args.versao_final), args.fragmentar, args.mesclar)
+        return 0
+    if args.comando == "distribuir":
+        if not os.path.exists(args.csv):
+            print(f"{Cores.VERMELHO}ERRO: Arquivo '{args.csv}' não encontrado!{Cores.RESET}")
+            return 1
+        distribute_tickets(args.csv, args.versao)
+        return 0
+    return executar_release(args.projetos, args.versao_novo, args.versao_final, args.modo, args.distribuir, args.versao_distribuicao, args.fragmentar, args.mesclar)
 
 # --- INTERFACE INTERATIVA (CLI) ---
 
@@ -411,6 +1732,13 @@ def get_input(prompt, example="", is_numeric=False):
         print(f"{Cores.VERMELHO}Entrada inválida. Tente novamente.{Cores.RESET}")
     return user_input
 
+def get_project_ids():
+    """Solicita um ou mais IDs de projeto, separados por vírgula ou espaço."""
+    while True:
+        user_input = get_input("Digite o(s) ID(s) do Projeto", "Ex: 115432 ou 115432, 115433")
+        if re.fullmatch(r'\d+([\s,]+\d+)*', user_input): return list(dict.fromkeys(re.split(r'[\s,]+', user_input)))
+        print(f"{Cores.VERMELHO}Entrada inválida. Tente novamente.{Cores.RESET}")
+
 def get_ppt_mode():
     """Solicita e valida o modo de geração do PowerPoint."""
     print(f"{Cores.AMARELO}>> Escolha o modo de geração do PowerPoint:{Cores.RESET}")
@@ -420,33 +1748,35 @@ def get_ppt_mode():
         print(f"{Cores.VERMELHO}Opção inválida. Escolha uma das opções acima.{Cores.RESET}")
     return choice
 
+ACOES_MENU = {'1': "verificar", '2': "csv", '3': "pptx", '4': "distribuir"}
+
 def main():
     """Função principal que executa o menu interativo."""
     criar_diretorios()
-    logger.debug('Logger inicializado.')
     while True:
         exibir_cabecalho("FERRAMENTA DE AUTOMAÇÃO DE TREINAMENTOS E TICKETS")
         print("\nEscolha uma opção:")
-        print(f"  {Cores.VERDE}1.{Cores.RESET} Verificar Pendências de Projeto")
+        print(f"  {Cores.VERDE}1.{Cores.RESET} Verificar Pendências de Projeto(s)")
         print(f"  {Cores.VERDE}2.{Cores.RESET} Gerar Arquivo CSV de Tickets por Projeto")
         print(f"  {Cores.VERDE}3.{Cores.RESET} Gerar Apresentação PowerPoint (.pptx)")
         print(f"  {Cores.VERDE}4.{Cores.RESET} Distribuir Tickets no Movidesk")
         print(f"\n  {Cores.VERMELHO}5. Sair{Cores.RESET}")
         choice = input(f"\n{Cores.AMARELO}>> Digite o número da opção desejada: {Cores.RESET}").strip()
+        if acao := ACOES_MENU.get(choice): METRICAS.iniciar(acao, PROFILE_SLOWEST_STAGE)
 
         if choice == '1':
             exibir_cabecalho("1. VERIFICAR PENDÊNCIAS")
-            project_id = get_input("Digite o ID do Projeto", "Ex: 115432", is_numeric=True)
+            projetos = get_project_ids()
             version_novo = get_input("Digite a Versão novo", "Ex: v123")
-            base_dir = os.path.join(TRAINING_ASSETS_BASE_PATH, version_novo)
-            verificar_projeto_no_banco(project_id, base_dir)
+            if _verificar(projetos, version_novo) and len(projetos) == 1 and \
+                    input(f"{Cores.AMARELO}>> Acompanhar as pendências enquanto os prints chegam? {Cores.CIANO}(s/N): {Cores.RESET}").strip().lower() == 's':
+                monitorar_pendencias(projetos[0], os.path.join(TRAINING_ASSETS_BASE_PATH, version_novo))
 
         elif choice == '2':
             exibir_cabecalho("2. GERAR ARQUIVO CSV")
             project_id = get_input("Digite o ID do Projeto", "Ex: 115432", is_numeric=True)
             version_novo = get_input("Digite a Versão novo", "Ex: v123")
-            output_file = os.path.join(RELATORIOS_DIR, f"TicketsTreinamento_Projeto_{project_id}.csv")
-            generate_csv_from_project(project_id, version_novo, output_file)
+            generate_csv_from_project(project_id, version_novo, _caminho_csv_projeto(project_id))
 
         elif choice == '3':
             exibir_cabecalho("3. GERAR APRESENTAÇÃO POWERPOINT")
@@ -457,20 +1787,14 @@ def main():
             else:
                 version_novo = get_input("Digite a Versão novo", "Ex: v123")
                 version_final_str = get_input("Digite a Versão final", "Ex: BIGL")
-                try: numero_final = int(version_final_str.split('.')[-1])
-                except (IndexError, ValueError): numero_final = 10
                 mode = get_ppt_mode()
                 base_dir = os.path.join(TRAINING_ASSETS_BASE_PATH, version_novo)
                 try:
-                    prs = Presentation(PPTX_TEMPLATE_PATH)
                     tickets_data = read_tickets_csv(tickets_path)
-                    process_directory(base_dir, version_final_str, prs, prs.slide_layouts[3], prs.slide_layouts[2], version_novo, mode, tickets_data, numero_final)
-                    output_file_name = f"treinamento_{mode}_{version_novo}_{version_final_str}.pptx"
-                    output_path = os.path.join(PPTX_DIR, output_file_name)
-                    prs.save(output_path)
-                    print(f"\n{Cores.VERDE}Apresentação salva como '{output_path}' com sucesso!{Cores.RESET}")
+                    _gerar_pptx(base_dir, version_final_str, version_novo, mode, tickets_data, _caminho_apresentacao(mode, version_novo, version_final_str))
                 except Exception as e:
-                    print(f"\n{Cores.VERMELHO}Ocorreu um erro ao gerar a apresentação: {e}{Cores.RESET}", exc_info=True)
+                    print(f"\n{Cores.VERMELHO}Ocorreu um erro ao gerar a apresentação: {e}{Cores.RESET}")
+                    logger.error("Erro ao gerar a apresentação", exc_info=True)
 
         elif choice == '4':
             exibir_cabecalho("4. DISTRIBUIR TICKETS NO MOVIDESK")
@@ -488,9 +1812,11 @@ def main():
             break
         else:
             print(f"\n{Cores.VERMELHO}Opção inválida. Por favor, escolha um número de 1 a 5.{Cores.RESET}")
+        if acao: print(f"Métricas da execução salvas em '{METRICAS.salvar()}'.")
 
         input(f"\n{Cores.AMARELO}Pressione Enter para voltar ao menu...{Cores.RESET}")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1: sys.exit(executar_cli(sys.argv[1:]))
     validar_configuracoes()
     main()
\ No newline at end of file